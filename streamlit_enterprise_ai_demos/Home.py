@@ -1,4 +1,5 @@
 import streamlit as st
+from enterprise_ai import models
 
 st.set_page_config(page_title="Enterprise AI Demos", page_icon="🤖", layout="centered")
 
@@ -8,8 +9,17 @@ st.markdown("Pages on the left:")
 st.markdown("1. Semantic Search – Ask questions over business documents by meaning.")
 st.markdown("2. Personalized Copy – Generate persona‑tailored outreach emails.")
 st.markdown("3. Lead Scoring Agent – Score leads and see why some are hotter.")
+st.markdown("4. Performance – Live timings, cache hit rates and memory for the three demos, with an opt-in profiler.")
 
 st.subheader("How to run locally")
 st.code("pip install -r requirements.txt\nstreamlit run Home.py", language="bash")
+st.markdown("The same search, scoring and copy objects are available headless as a JSON API (handy for load tests):")
+st.code("python -m enterprise_ai.server --port 8080", language="bash")
+st.markdown("To score multi-GB lead exports without uploading them, put them in one folder and point `ENTERPRISE_AI_LEADS_DIR` at it; the Lead Scoring page only reads server-side CSVs from there.")
+
+# Start loading the search and copy models now, so they are warm by the time a page needs them
+models.warm_defaults()
+with st.expander("Model status"):
+    st.json(models.manager.report())
 
 st.info("Tip for workshops: deploy on Streamlit Community Cloud or Hugging Face Spaces and share the URL.")
@@ -0,0 +1,164 @@
+"""Load time, memory, throughput and output quality of each CPU inference mode.
+
+Run from the app folder:  python -m benchmarks.bench_inference [--threads 1 2 4 8] [--skip-generate]
+
+Every (mode, thread count) pair runs in a fresh subprocess, so load memory is
+not inflated by models from earlier runs. The last lines report the fastest
+thread count per mode, i.e. the value to use for ``ENTERPRISE_AI_THREADS``.
+
+Embedding quality is the cosine agreement of each mode's vectors with fp32
+(PASS when the minimum is at least --min-cosine). Generation quality is a
+sanity check: non-empty, long enough and not degenerate repetition.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from enterprise_ai import inference
+from enterprise_ai.copywriter import MODEL_NAME as COPY_MODEL, build_prompt
+from enterprise_ai.ingest import chunk_text, discover_files, read_path
+from enterprise_ai.metrics import rss_mb
+from enterprise_ai.search import MODEL_NAME as SEARCH_MODEL
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sample_sentences(n):
+    docs = [read_path(p) for _, p in discover_files(os.path.join(APP_DIR, "sample_documents"))]
+    lines = [c for d in docs for c in chunk_text(d, max_size=200)]
+    return (lines * (n // max(len(lines), 1) + 1))[:n]
+
+
+def generation_sane(text, min_words=15):
+    words = text.split()
+    return len(words) >= min_words and len(set(words)) / len(words) > 0.3
+
+
+def thread_sweep():
+    # Powers of two up to the CPUs this process may use, plus that count itself
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    counts = {cpus}
+    n = 1
+    while n < cpus:
+        counts.add(n)
+        n *= 2
+    return sorted(counts)
+
+
+def bench_encoder(mode, sentences, reference):
+    import sentence_transformers  # noqa: F401 - imported first so rss_delta_mb is the model alone
+    before = rss_mb()
+    start = time.perf_counter()
+    model = inference.load_sentence_model(SEARCH_MODEL, mode)
+    load_s = time.perf_counter() - start
+    model.encode(sentences[:8])  # warm-up
+    start = time.perf_counter()
+    embs = np.asarray(model.encode(sentences, batch_size=64, normalize_embeddings=True), dtype=np.float32)
+    elapsed = time.perf_counter() - start
+    out = {
+        "model": SEARCH_MODEL, "mode": mode, "load_s": round(load_s, 2),
+        "rss_delta_mb": round(rss_mb() - before, 1),
+        "sentences_per_sec": round(len(sentences) / elapsed, 1),
+    }
+    if reference is not None:
+        agree = np.sum(embs * reference, axis=1)
+        out.update(cosine_mean=round(float(agree.mean()), 4), cosine_min=round(float(agree.min()), 4))
+    return out, embs
+
+
+def bench_generator(mode, runs):
+    import transformers  # noqa: F401 - imported first so rss_delta_mb is the model alone
+    before = rss_mb()
+    start = time.perf_counter()
+    tok, model = inference.load_seq2seq(COPY_MODEL, mode)
+    load_s = time.perf_counter() - start
+    inputs = tok(build_prompt("cloud backup solution", "CFO", "professional", "Book a demo"), return_tensors="pt").to(model.device)
+    latencies, text = [], ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        # Greedy keeps runs comparable across modes
+        outputs = model.generate(**inputs, max_new_tokens=120, do_sample=False)
+        latencies.append((time.perf_counter() - start) * 1000)
+        text = tok.decode(outputs[0], skip_special_tokens=True)
+    return {
+        "model": COPY_MODEL, "mode": mode, "load_s": round(load_s, 2),
+        "rss_delta_mb": round(rss_mb() - before, 1),
+        "generate_ms_median": round(float(np.median(latencies)), 1),
+        "output_sane": generation_sane(text),
+        "sample": text[:120],
+    }
+
+
+def run_worker(args):
+    # One measurement in this (fresh) process; prints a single JSON row
+    inference.configure_threads(args.threads[0])
+    mode = args.modes[0]
+    if args.worker == "generator":
+        row = bench_generator(mode, args.generate_runs)
+    else:
+        reference = np.load(args.reference) if mode != "fp32" and os.path.exists(args.reference) else None
+        row, embs = bench_encoder(mode, sample_sentences(args.sentences), reference)
+        if mode == "fp32" and not os.path.exists(args.reference):
+            np.save(args.reference, embs)
+    row["threads"] = args.threads[0]
+    print(json.dumps(row))
+
+
+def spawn(kind, mode, threads, args, reference):
+    cmd = [sys.executable, "-m", "benchmarks.bench_inference", "--worker", kind, "--modes", mode,
+           "--threads", str(threads), "--sentences", str(args.sentences),
+           "--generate-runs", str(args.generate_runs), "--reference", reference]
+    out = subprocess.run(cmd, cwd=APP_DIR, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise SystemExit(f"{kind} {mode} with {threads} threads failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--modes", nargs="+", default=inference.available_modes())
+    ap.add_argument("--threads", nargs="+", type=int, default=thread_sweep(), help="intra-op thread counts to sweep")
+    ap.add_argument("--sentences", type=int, default=512)
+    ap.add_argument("--generate-runs", type=int, default=3)
+    ap.add_argument("--min-cosine", type=float, default=0.98)
+    ap.add_argument("--skip-generate", action="store_true")
+    ap.add_argument("--worker", choices=["encoder", "generator"], help=argparse.SUPPRESS)
+    ap.add_argument("--reference", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.worker:
+        run_worker(args)
+        return
+
+    best = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = os.path.join(tmp, "fp32.npy")
+        # fp32 first: it is the reference the other modes are checked against
+        for mode in sorted(args.modes, key=lambda m: m != "fp32"):
+            for threads in args.threads:
+                row = spawn("encoder", mode, threads, args, reference)
+                if "cosine_min" in row:
+                    row["quality_pass"] = row["cosine_min"] >= args.min_cosine
+                print(json.dumps(row))
+                key = ("encoder", mode)
+                if key not in best or row["sentences_per_sec"] > best[key]["sentences_per_sec"]:
+                    best[key] = row
+        if not args.skip_generate:
+            for mode in args.modes:
+                for threads in args.threads:
+                    row = spawn("generator", mode, threads, args, reference)
+                    print(json.dumps(row))
+                    key = ("generator", mode)
+                    if key not in best or row["generate_ms_median"] < best[key]["generate_ms_median"]:
+                        best[key] = row
+    for (kind, mode), row in best.items():
+        print(json.dumps({"best_threads": row["threads"], "kind": kind, "mode": mode}))
+
+
+if __name__ == "__main__":
+    main()
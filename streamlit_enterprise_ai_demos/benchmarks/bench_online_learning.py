@@ -0,0 +1,64 @@
+"""Online (SGD, hashed features) vs. full-batch retrain as new outcomes arrive.
+
+Simulates an initial training set followed by mini-batches of labelled leads,
+some from industries and regions never seen before. After every batch both
+models are brought up to date and evaluated on the same holdout.
+
+Run from the app folder:  python -m benchmarks.bench_online_learning
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_leads
+from enterprise_ai.leads import LeadScorer, synthetic_labels
+from enterprise_ai.online_leads import OnlineLeadScorer
+
+
+def labelled(n, seed, new_values_share=0.0):
+    df = make_leads(n, seed)
+    if new_values_share:
+        rng = np.random.default_rng(seed)
+        fresh = rng.random(n) < new_values_share
+        df.loc[fresh, "Industry"] = "Biotech"
+        df.loc[fresh, "Region"] = "MEA"
+    df["did_convert"] = synthetic_labels(df, seed=seed)
+    return df
+
+
+def accuracy(scorer, df):
+    return float(np.mean((scorer.predict(df) >= 0.5) == df["did_convert"].to_numpy()))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--initial", type=int, default=50_000)
+    ap.add_argument("--batches", type=int, default=10)
+    ap.add_argument("--batch-size", type=int, default=2_000)
+    args = ap.parse_args()
+
+    history = labelled(args.initial, seed=1)
+    holdout = labelled(20_000, seed=99, new_values_share=0.2)
+    full, online = LeadScorer().fit(history), OnlineLeadScorer().fit(history)
+    print(f"{'batch':>5} {'rows':>8} {'full ms':>9} {'online ms':>10} {'full acc':>9} {'online acc':>11}")
+    full_ms, online_ms = [], []
+    for b in range(args.batches):
+        batch = labelled(args.batch_size, seed=100 + b, new_values_share=0.2)
+        history = pd.concat([history, batch], ignore_index=True)
+        full_ms.append(timed(lambda: full.fit(history)))
+        online_ms.append(timed(lambda: online.update(batch)))
+        print(f"{b + 1:>5} {len(history):>8,} {full_ms[-1]:>9.1f} {online_ms[-1]:>10.1f} "
+              f"{accuracy(full, holdout):>9.3f} {accuracy(online, holdout):>11.3f}")
+    print(f"median update latency: full retrain {np.median(full_ms):.1f} ms, online {np.median(online_ms):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""End-to-end benchmark of the three demos on synthetic data, as JSON.
+
+Covers document indexing throughput, query latency percentiles per retrieval
+mode and vector backend, lead scoring rows/sec, and copy generation latency.
+By default the encoder and generator are the offline stubs in
+``benchmarks.stubs``; ``--real-models`` loads MiniLM and flan-t5 instead.
+
+Run from the app folder:
+
+    python -m benchmarks.run_all --out bench.json
+    python -m benchmarks.run_all --out new.json --baseline bench.json
+
+Metric names are stable, so two result files can be diffed directly or with
+``--baseline``, which prints the relative change of every shared metric.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from functools import partial
+
+import numpy as np
+
+from benchmarks.stubs import StubEncoder, stub_copy_generator
+from benchmarks.synthetic import make_documents, make_leads, make_queries
+from enterprise_ai import inference
+from enterprise_ai.cache import LRUCache
+from enterprise_ai.copywriter import CopyGenerator, variant_personas
+from enterprise_ai.embedding_store import EmbeddingStore
+from enterprise_ai.ingest import approx_tokens, chunk_text, discover_files, read_path
+from enterprise_ai.leads import LeadScorer
+from enterprise_ai.online_leads import OnlineLeadScorer
+from enterprise_ai.retrieval import MODES
+from enterprise_ai.search import CHUNK_OVERLAP, CHUNK_TOKENS, MODEL_NAME, DocumentIndex
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentiles(samples_ms):
+    a = np.asarray(samples_ms)
+    return {
+        "p50_ms": round(float(np.percentile(a, 50)), 3),
+        "p95_ms": round(float(np.percentile(a, 95)), 3),
+        "p99_ms": round(float(np.percentile(a, 99)), 3),
+        "mean_ms": round(float(a.mean()), 3),
+    }
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def git_version():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=APP_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def bench_indexing(model, docs_dir, cache_dir, n_docs):
+    paths = list(discover_files(docs_dir))
+    texts, read_s = timed(lambda: [read_path(p) for _, p in paths])
+    chunks, chunk_s = timed(lambda: [c for t in texts for c in chunk_text(t, CHUNK_TOKENS, CHUNK_OVERLAP, approx_tokens)])
+    mb = sum(len(t.encode("utf-8")) for t in texts) / 2 ** 20
+    sources = [(name, partial(read_path, path)) for name, path in paths]
+    out = {
+        "docs": n_docs,
+        "chunks": len(chunks),
+        "read_mb_per_sec": round(mb / read_s, 2),
+        "chunk_mb_per_sec": round(mb / chunk_s, 2),
+    }
+    # Cold: every chunk goes through the encoder; warm: all vectors come from the on-disk store
+    for label in ("cold", "warm"):
+        doc_index = DocumentIndex(model, EmbeddingStore(cache_dir, "bench"))
+        _, secs = timed(lambda: doc_index.build(sources))
+        out[f"build_{label}_s"] = round(secs, 3)
+        out[f"build_{label}_chunks_per_sec"] = round(len(doc_index) / secs, 1)
+    for backend in ("exact", "ivf"):
+        _, secs = timed(lambda: doc_index.vector_index(backend))
+        out[f"{backend}_index_build_ms"] = round(secs * 1000, 2)
+    return doc_index, out
+
+
+def bench_queries(doc_index, queries, top_k=3):
+    out = {}
+    for backend in ("exact", "ivf"):
+        for mode in MODES:
+            samples = []
+            for q in queries:
+                # End to end: the query embedding is recomputed too
+                doc_index.encoder.cache.clear()
+                _, secs = timed(lambda: doc_index.search(q, mode, top_k, backend, use_cache=False))
+                samples.append(secs * 1000)
+            out[f"{mode}/{backend}"] = percentiles(samples)
+    # Repeated questions are answered from the result cache
+    for q in queries:
+        doc_index.search(q, "hybrid", top_k)
+    samples = [timed(lambda: doc_index.search(q, "hybrid", top_k))[1] * 1000 for q in queries]
+    out["hybrid/exact/cached"] = percentiles(samples)
+    _, secs = timed(lambda: doc_index.search_batch(queries, top_k))
+    out["search_batch_queries_per_sec"] = round(len(queries) / secs, 1)
+    return out
+
+
+def bench_leads(n_rows, n_train, n_single=2_000, update_rows=1_000):
+    train, df = make_leads(n_train, seed=1), make_leads(n_rows, seed=2)
+    scorer, fit_s = timed(lambda: LeadScorer().fit(train))
+    _, score_s = timed(lambda: scorer.score(df))
+    leads = df.head(n_single).to_dict("records")
+    single = [timed(lambda: scorer.score_one(lead))[1] * 1000 for lead in leads]
+    online, online_fit_s = timed(lambda: OnlineLeadScorer().fit(train))
+    _, online_score_s = timed(lambda: online.score(df))
+    batch = make_leads(update_rows, seed=3)
+    batch["did_convert"] = (np.random.default_rng(3).random(update_rows) < 0.3).astype(int)
+    _, update_s = timed(lambda: online.update(batch))
+    return {
+        "rows": n_rows,
+        "fit_s": round(fit_s, 3),
+        "score_rows_per_sec": round(n_rows / score_s),
+        "score_one": percentiles(single),
+        "online_fit_s": round(online_fit_s, 3),
+        "online_score_rows_per_sec": round(n_rows / online_score_s),
+        f"online_update_{update_rows}_ms": round(update_s * 1000, 2),
+    }
+
+
+def bench_copy(generator, n_requests, variants=3):
+    products = [f"product {i}" for i in range(n_requests)]
+    out = {}
+    for label, use_ai in (("model", True), ("template", False)):
+        samples, tps = [], []
+        for product in products:
+            _, stats = generator.generate_batch(product, variant_personas("CFO", variants), "professional", "Book a demo", use_ai=use_ai)
+            samples.append(stats["latency_ms"])
+            tps.append(stats["tokens_per_sec"])
+        out[label] = percentiles(samples)
+        if use_ai:
+            out[label]["tokens_per_sec"] = round(float(np.mean(tps)), 1)
+    # Template emails go through the cache: fill it, then time a pass that is all hits
+    for p in products:
+        generator.fallback(p, "CFO", "professional", "Book a demo")
+    samples = [timed(lambda: generator.fallback(p, "CFO", "professional", "Book a demo"))[1] * 1000 for p in products]
+    out["template_cached"] = percentiles(samples)
+    return out
+
+
+def compare(results, baseline, prefix=""):
+    # Yields (metric, old, new) for every numeric leaf present in both
+    for key, new in results.items():
+        old = baseline.get(key) if isinstance(baseline, dict) else None
+        if isinstance(new, dict):
+            yield from compare(new, old or {}, f"{prefix}{key}.")
+        elif isinstance(new, (int, float)) and isinstance(old, (int, float)):
+            yield f"{prefix}{key}", old, new
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--docs", type=int, default=2_000, help="synthetic documents to index")
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--leads", type=int, default=200_000, help="rows to score")
+    ap.add_argument("--train-leads", type=int, default=10_000)
+    ap.add_argument("--copy-requests", type=int, default=10)
+    ap.add_argument("--real-models", action="store_true", help="load MiniLM and flan-t5 instead of the stubs")
+    ap.add_argument("--mode", default=inference.DEFAULT_MODE, choices=inference.MODES, help="inference mode for --real-models")
+    ap.add_argument("--stub-encode-us", type=float, default=0.0, help="simulated encoder cost per text")
+    ap.add_argument("--stub-token-ms", type=float, default=0.0, help="simulated generator cost per new token")
+    ap.add_argument("--skip", nargs="*", default=[], choices=["indexing", "queries", "leads", "copy"])
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="write JSON here instead of stdout")
+    ap.add_argument("--baseline", help="earlier result file to compare against")
+    args = ap.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        if not {"indexing", "queries"} <= set(args.skip):
+            if args.real_models:
+                model = inference.load_sentence_model(MODEL_NAME, args.mode)
+            else:
+                model = StubEncoder(cost_us=args.stub_encode_us)
+            docs_dir = os.path.join(tmp, "docs")
+            os.makedirs(docs_dir)
+            for name, text in make_documents(args.docs, seed=args.seed):
+                with open(os.path.join(docs_dir, name), "w", encoding="utf-8") as f:
+                    f.write(text)
+            doc_index, results["indexing"] = bench_indexing(model, docs_dir, os.path.join(tmp, "store"), args.docs)
+            if "queries" not in args.skip:
+                results["queries"] = bench_queries(doc_index, make_queries(args.queries, seed=args.seed))
+            if "indexing" in args.skip:
+                del results["indexing"]
+        if "leads" not in args.skip:
+            results["leads"] = bench_leads(args.leads, args.train_leads)
+        if "copy" not in args.skip:
+            generator = CopyGenerator(mode=args.mode, cache=LRUCache(maxsize=1024))
+            if args.real_models:
+                generator.load()
+                if generator.load_error is not None:
+                    raise SystemExit(f"Could not load {generator.model_name}: {generator.load_error}")
+            else:
+                stub_copy_generator(generator, args.stub_token_ms)
+            results["copy"] = bench_copy(generator, args.copy_requests)
+
+    report = {
+        "meta": {
+            "version": git_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count(),
+            "models": "real" if args.real_models else "stub",
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        for metric, old, new in compare(results, baseline):
+            change = f"{(new - old) / old:+.1%}" if old else "n/a"
+            print(f"{metric:<55} {old:>14,.3f} -> {new:>14,.3f}  {change}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
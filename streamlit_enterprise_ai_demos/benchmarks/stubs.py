@@ -0,0 +1,112 @@
+"""Small offline stand-ins for the MiniLM encoder and the flan-t5 generator.
+
+They implement just the interface the app uses, so indexing, search and copy
+generation run end to end without torch or downloaded weights. Absolute
+numbers measure the app's own overhead plus an optional simulated model cost,
+not model speed.
+"""
+import re
+import time
+import zlib
+
+import numpy as np
+
+from enterprise_ai.copywriter import generate_fallback_copy
+
+_WORD = re.compile(r"\w+")
+
+
+class StubEncoder:
+    """Hashed bag-of-words embeddings, a ``SentenceTransformer`` look-alike.
+
+    Texts sharing words get similar vectors, so retrieval results are
+    meaningful enough to exercise ranking. ``cost_us`` sleeps per text to mimic
+    model latency.
+    """
+
+    def __init__(self, dim=384, cost_us=0.0):
+        self.dim = dim
+        self.cost_us = cost_us
+        self._rows = {}
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def _row(self, word):
+        row = self._rows.get(word)
+        if row is None:
+            row = self._rows[word] = np.random.default_rng(zlib.crc32(word.encode("utf-8"))).standard_normal(self.dim).astype(np.float32)
+        return row
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        if self.cost_us:
+            time.sleep(len(texts) * self.cost_us / 1e6)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in _WORD.findall(text.lower()):
+                out[i] += self._row(word)
+        if normalize_embeddings:
+            out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-12)
+        return out[0] if single else out
+
+
+class _Batch(dict):
+    def to(self, device):
+        return self
+
+
+class StubTokenizer:
+    """Whitespace tokenizer over a vocabulary that grows as it sees words."""
+
+    pad_token_id = 0
+
+    def __init__(self):
+        self.vocab = {"<pad>": 0}
+        self.words = ["<pad>"]
+
+    def _ids(self, text):
+        ids = []
+        for word in text.split():
+            if word not in self.vocab:
+                self.vocab[word] = len(self.words)
+                self.words.append(word)
+            ids.append(self.vocab[word])
+        return ids
+
+    def __call__(self, texts, return_tensors=None, padding=False, truncation=False, max_length=None, add_special_tokens=True):
+        single = isinstance(texts, str)
+        rows = [self._ids(t)[:max_length] for t in ([texts] if single else texts)]
+        if single:
+            return _Batch(input_ids=rows[0])
+        width = max(map(len, rows), default=0)
+        return _Batch(input_ids=np.array([r + [0] * (width - len(r)) for r in rows], dtype=np.int64))
+
+    def batch_decode(self, sequences, skip_special_tokens=True):
+        return [" ".join(self.words[i] for i in row if i or not skip_special_tokens) for row in sequences]
+
+
+class StubSeq2Seq:
+    """Answers every prompt with the same template email, sleeping ``cost_ms`` per new token."""
+
+    device = "cpu"
+
+    def __init__(self, tokenizer, cost_ms=0.0):
+        self.tokenizer = tokenizer
+        self.cost_ms = cost_ms
+        self._email = tokenizer._ids(generate_fallback_copy("cloud backup", "customer", "professional", "Book a demo"))
+
+    def generate(self, input_ids, num_return_sequences=1, max_new_tokens=None, **kwargs):
+        rows = [self._email[:max_new_tokens]] * (len(input_ids) * num_return_sequences)
+        width = max(map(len, rows), default=0)
+        if self.cost_ms:
+            time.sleep(width * self.cost_ms / 1000)
+        return np.array([r + [0] * (width - len(r)) for r in rows], dtype=np.int64)
+
+
+def stub_copy_generator(generator, cost_ms=0.0):
+    """Fit ``generator`` (a ``CopyGenerator``) with the stub tokenizer and model."""
+    generator.tokenizer = StubTokenizer()
+    generator.model = StubSeq2Seq(generator.tokenizer, cost_ms)
+    return generator
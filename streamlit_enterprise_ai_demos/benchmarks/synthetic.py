@@ -0,0 +1,82 @@
+"""Scalable synthetic data following the shape of the bundled samples."""
+import numpy as np
+import pandas as pd
+
+FIRST_NAMES = ["Petr", "Alex", "Jana", "Marco", "Eva", "Lena", "Tomas", "Sara", "Jon", "Mia"]
+LAST_NAMES = ["Novak", "Smith", "Horakova", "Rossi", "Kral", "Muller", "Dvorak", "Garcia", "Berg", "Costa"]
+COMPANY_SIZES = ["SMB", "Mid-Market", "Enterprise"]
+INDUSTRIES = ["Finance", "SaaS", "Retail", "Manufacturing", "Healthcare", "Logistics", "Energy", "Education"]
+LEAD_SOURCES = ["Website", "Webinar", "Outbound", "Referral", "Conference"]
+REGIONS = ["EU", "US", "EMEA", "APAC", "LATAM"]
+
+
+def make_leads(n, seed=0):
+    """``n`` leads with the ``leads.csv`` schema."""
+    rng = np.random.default_rng(seed)
+    first = np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), n)]
+    last = np.array(LAST_NAMES, dtype=object)[rng.integers(0, len(LAST_NAMES), n)]
+    return pd.DataFrame({
+        "Name": first + " " + last,
+        "CompanySize": rng.choice(COMPANY_SIZES, n, p=[0.5, 0.3, 0.2]),
+        "Industry": rng.choice(INDUSTRIES, n),
+        "EngagementLevel": rng.integers(1, 6, n),
+        "PagesViewed": rng.poisson(7, n),
+        "RequestedPricing": (rng.random(n) < 0.35).astype(int),
+        "LeadSource": rng.choice(LEAD_SOURCES, n),
+        "Region": rng.choice(REGIONS, n),
+    })
+
+DOC_TYPES = [
+    "Master Service Agreement", "Cloud Service Agreement", "Data Privacy Policy", "Employment Contract",
+    "Company HR Policy", "Standard Mortgage Loan Terms", "Refund & Returns Policy", "Supplier Code of Conduct",
+]
+DOC_SCOPES = ["Excerpt", "Key Terms", "Finance Division", "Retail Division", "Analyst Position", "EU Operations"]
+# (topic, clause template, question) - placeholders are filled with random values
+CLAUSES = [
+    ("Payment terms", "Net {days} days from invoice date.", "What are the payment terms?"),
+    ("SLA", "{pct}% monthly uptime commitment, with service credits for downtime.", "What uptime does the SLA guarantee?"),
+    ("Notice period", "Either party may terminate with {days} days' written notice.", "What is the notice period?"),
+    ("Data Location", "Customer data stored in {region} data centers only.", "Where is customer data stored?"),
+    ("Retention", "Records are retained for {years} years after closure.", "How long are records retained?"),
+    ("Refund window", "{days} calendar days from delivery.", "How long do I have to request a refund?"),
+    ("Compensation", "Annual gross salary of EUR {salary:,}, payable monthly.", "What is the annual salary?"),
+    ("Vacation", "{vacation} working days per year, in addition to public holidays.", "How many vacation days are there?"),
+    ("Interest Rate", "Fixed at {rate}% annually for the first {years} years, variable thereafter.", "What is the interest rate?"),
+    ("Liability cap", "Limited to {months} months of fees paid under the agreement.", "What is the liability cap?"),
+    ("Remote work", "Employees may work remotely up to {wfh} days per week.", "How many remote work days are allowed?"),
+    ("Late Payment", "Fee of {rate}% of the overdue amount per month.", "What is the late payment fee?"),
+    ("Security", "Multi-factor authentication and {freq} penetration testing.", "How often is penetration testing done?"),
+    ("Governing Law", "Agreement subject to the laws of {country}.", "Which law governs the agreement?"),
+]
+DATA_REGIONS = ["EU", "US", "UK", "APAC", "Swiss"]
+COUNTRIES = ["the Netherlands", "Germany", "Ireland", "the Czech Republic", "Sweden"]
+FREQUENCIES = ["quarterly", "annual", "monthly", "biannual"]
+
+
+def make_documents(n, seed=0, min_clauses=5, max_clauses=40):
+    """``n`` ``(name, text)`` documents in the style of ``sample_documents/*.txt``."""
+    rng = np.random.default_rng(seed)
+    docs = []
+    for d in range(n):
+        doc_type = DOC_TYPES[rng.integers(len(DOC_TYPES))]
+        year = int(rng.integers(2020, 2026))
+        lines = [f"{doc_type} – {DOC_SCOPES[rng.integers(len(DOC_SCOPES))]} ({year})"]
+        for i in range(int(rng.integers(min_clauses, max_clauses + 1))):
+            topic, template, _ = CLAUSES[rng.integers(len(CLAUSES))]
+            clause = template.format(
+                days=int(rng.choice([7, 14, 30, 45, 60, 90])), pct=rng.choice(["99.5", "99.9", "99.95", "99.99"]),
+                region=DATA_REGIONS[rng.integers(len(DATA_REGIONS))], years=int(rng.integers(1, 11)),
+                salary=int(rng.integers(40, 120)) * 1000, vacation=int(rng.integers(20, 31)),
+                rate=round(float(rng.uniform(0.5, 7.5)), 1), months=int(rng.choice([6, 12, 24])),
+                wfh=int(rng.integers(1, 5)), freq=FREQUENCIES[rng.integers(len(FREQUENCIES))],
+                country=COUNTRIES[rng.integers(len(COUNTRIES))],
+            )
+            lines.append(f"{i + 1}) {topic}: {clause}")
+        docs.append((f"{doc_type.replace(' ', '_').replace('&', 'and')}_{d:05d}.txt", "\n".join(lines) + "\n"))
+    return docs
+
+
+def make_queries(n, seed=0):
+    """``n`` questions about the clauses ``make_documents`` writes."""
+    rng = np.random.default_rng(seed)
+    return [CLAUSES[i][2] for i in rng.integers(0, len(CLAUSES), n)]
@@ -0,0 +1,5 @@
+# Lets plain `pytest` (from here or the repo root) import enterprise_ai, as the app and benchmarks do
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
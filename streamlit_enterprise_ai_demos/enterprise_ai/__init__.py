@@ -0,0 +1 @@
+"""Shared building blocks for the Enterprise AI demo pages."""
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import threading
+import time
+
+from enterprise_ai import inference, metrics
+
+MODEL_NAME = "google/flan-t5-base"
+GENERATION_KWARGS = dict(
+    max_new_tokens=300,
+    num_beams=4,
+    do_sample=True,
+    temperature=0.7,
+    top_p=0.9,
+    early_stopping=True,
+)
+VARIANT_SUFFIXES = ["", " who is budget-conscious", " at a growing company"]
+
+
+def variant_personas(persona, n):
+    """Persona strings for the first ``n`` variants (base, budget-conscious, growing company)."""
+    return [persona + suffix for suffix in VARIANT_SUFFIXES[:n]]
+
+
+def build_prompt(product, persona, tone, cta):
+    return f"""Write a professional B2B sales email with:
+
+Subject: [compelling subject line]
+
+Body: [120-180 words, {tone} tone]
+
+Product: {product}
+Target: {persona}
+Call-to-action: {cta}
+
+Format:
+Subject: [subject line]
+[email body with clear value proposition and single CTA]"""
+
+
+def normalize_product(product):
+    return " ".join(product.split())
+
+
+def split_email(text):
+    """Return ``(subject, body)``; subject is None when the text has no ``Subject:`` line."""
+    if "Subject:" not in text:
+        return None, text
+    rest = text.split("Subject:", 1)[1]
+    lines = rest.split("\n", 1)
+    return lines[0].strip(), lines[1].strip() if len(lines) > 1 else ""
+
+
+def generate_fallback_copy(product, persona, tone, cta):
+    """Fallback text generation when AI model is not available"""
+    
+    # Handle modified personas (e.g., "CFO who is budget-conscious")
+    base_persona = persona.split(" who is")[0].split(" at a")[0]
+    
+    templates = {
+        "CFO": {
+            "professional": f"Subject: Reduce Operational Costs by 30% with {product.title()}\n\nDear CFO,\n\nAs a financial leader, you're constantly seeking ways to optimize costs while maintaining quality. Our {product} has helped finance teams like yours achieve significant cost reductions through improved efficiency and streamlined operations.\n\nKey financial benefits:\n• Average 30% reduction in operational costs\n• Improved ROI within 6 months\n• Enhanced data security and compliance\n• Reduced manual processes and errors\n\nI'd love to show you how [Company Name] can help your organization save money while improving performance.\n\n{cta} to schedule a brief 15-minute call where I can share specific cost-saving strategies relevant to your industry.\n\nBest regards,\n[Your Name]\nSenior Sales Executive",
+            
+            "friendly": f"Subject: Quick Question About Your {product.title()} Costs\n\nHi there,\n\nI hope this email finds you well! I'm reaching out because I work with CFOs who are always looking for smart ways to reduce costs without sacrificing quality.\n\nOur {product} has been a game-changer for finance teams - helping them cut operational expenses by an average of 30% while actually improving their processes.\n\nI thought you might be interested in hearing about some of the cost-saving strategies we've implemented for companies similar to yours.\n\nWould you be open to a quick 15-minute conversation? {cta} and I'll share some insights that might be valuable for your team.\n\nThanks for your time!\n[Your Name]",
+            
+            "bold": f"Subject: Your Current {product.title()} is Costing You 40% More Than It Should\n\nDear CFO,\n\nHere's an uncomfortable truth: most companies are overspending on {product} by 40% due to inefficient solutions and poor optimization.\n\nOur {product} delivers immediate results:\n• 30% cost reduction from day one\n• Enterprise-grade security and compliance\n• Zero downtime implementation\n• Measurable ROI within 90 days\n\nDon't let another quarter pass with suboptimal performance eating into your budget.\n\n{cta} now and see exactly how much you could be saving.\n\nReady to stop wasting money?\n[Your Name]\nVP of Sales"
+        },
+        "IT Manager": {
+            "professional": f"Subject: Streamline Your IT Infrastructure with {product.title()}\n\nDear IT Manager,\n\nManaging complex IT environments requires solutions that are both powerful and reliable. Our {product} is specifically designed for IT professionals who need seamless integration, advanced security, and 24/7 reliability.\n\nTechnical advantages:\n• Seamless integration with existing systems\n• Advanced security features and compliance\n• 24/7 monitoring and proactive support\n• Scalable architecture that grows with your needs\n\nI'd like to discuss how our {product} can enhance your IT operations and reduce your team's workload.\n\n{cta} to schedule a technical demo where we can explore integration possibilities and answer your specific questions.\n\nBest regards,\n[Your Name]\nTechnical Sales Engineer",
+            
+            "friendly": f"Subject: Hey IT Pro! Quick Question About {product.title()}\n\nHi,\n\nI know you're probably juggling a million things right now (aren't we all in IT?), but I thought you'd be interested in our {product}.\n\nIt's designed specifically for IT teams like yours - easy to deploy, integrates with your existing stack, and actually makes your job easier (I promise!).\n\nWe've helped IT managers reduce their daily firefighting by 50% while improving system reliability.\n\nWant to see how it works? {cta} and I'll show you a quick demo that won't waste your time.\n\nCheers,\n[Your Name]\nSolutions Architect",
+            
+            "bold": f"Subject: Stop Fighting with Outdated {product.title()} Systems\n\nDear IT Manager,\n\nYou're tired of band-aid solutions and constant troubleshooting. Your current {product} is holding your team back from focusing on strategic initiatives.\n\nOur {product} is built for modern IT teams who demand better:\n• Lightning-fast deployment (up and running in hours, not weeks)\n• Zero learning curve for your team\n• Enterprise-grade security and compliance\n• 99.9% uptime guarantee with proactive monitoring\n\n{cta} and see why forward-thinking IT teams are making the switch.\n\nTime to stop fighting your tools and start winning with them?\n[Your Name]\nVP of Engineering"
+        },
+        "Small Business Owner": {
+            "professional": f"Subject: Scale Your Business with {product.title()}\n\nDear Business Owner,\n\nGrowing a business requires solutions that deliver enterprise-level results without enterprise-level complexity. Our {product} is designed specifically for small and medium businesses that need to compete with larger organizations.\n\nBusiness benefits:\n• Affordable pricing with transparent, no-hidden-fee structure\n• Easy setup and management (no technical expertise required)\n• Scalable solution that grows with your business\n• Dedicated support team that understands small business challenges\n\nI'd love to show you how other businesses like yours have used our {product} to increase efficiency and drive growth.\n\n{cta} to schedule a brief consultation where we can discuss your specific business goals and how we can help you achieve them.\n\nBest regards,\n[Your Name]\nBusiness Development Manager",
+            
+            "friendly": f"Subject: Quick Question About Growing Your Business\n\nHi there,\n\nI hope business is going well! I wanted to reach out because I work with small business owners like you who are looking to grow and improve their operations.\n\nOur {product} has helped hundreds of small businesses streamline their processes, save time, and increase their revenue - all without breaking the bank.\n\nI thought you might be interested in hearing about some of the success stories from businesses similar to yours.\n\nInterested in learning more? {cta} and let's chat about how we can help your business succeed and grow.\n\nLooking forward to hearing from you!\n[Your Name]\nSmall Business Specialist",
+            
+            "bold": f"Subject: Your Competitors Are Using {product.title()} - Are You?\n\nDear Business Owner,\n\nEvery day you wait is money lost. Your competitors are already using solutions like our {product} to get ahead, while you're stuck with outdated processes.\n\nHere's what you're missing:\n• 25% increase in operational efficiency\n• Reduced costs and improved profit margins\n• Better customer satisfaction and retention\n• Competitive advantage in your market\n\nDon't get left behind while your competitors pull ahead.\n\n{cta} now and see how you can start winning today.\n\nReady to compete and win?\n[Your Name]\nGrowth Specialist"
+        }
+    }
+    
+    return templates.get(base_persona, {}).get(tone, f"Subject: {product.title()} Solution for {persona}\n\nDear {persona},\n\nI wanted to introduce you to our {product} solution. It's designed to help professionals like you achieve better results and improve your operations.\n\nKey benefits:\n• Improved efficiency and productivity\n• Cost-effective solution\n• Easy to implement and use\n• Dedicated support team\n\n{cta} to learn more about how we can help you succeed.\n\nBest regards,\n[Your Name]\nSales Team")
+
+
+class CopyGenerator:
+    """flan-t5 email writer with a template fallback when the model is unavailable."""
+
+    def __init__(self, model_name=MODEL_NAME, mode=inference.DEFAULT_MODE, cache=None):
+        self.model_name = model_name
+        self.mode = mode
+        self.cache = cache  # optional LRUCache / PersistentLRUCache of generated emails
+        self.tokenizer = None
+        self.model = None
+        self.load_error = None
+
+    @property
+    def model_loaded(self):
+        return self.model is not None
+
+    def load(self):
+        try:
+            self.tokenizer, self.model = inference.load_seq2seq(self.model_name, self.mode)
+        except Exception as e:
+            self.tokenizer, self.model, self.load_error = None, None, e
+        return self
+
+    def _cache_key(self, kind, **fields):
+        payload = {"kind": kind, "model": self.model_name, "mode": self.mode, "params": GENERATION_KWARGS, **fields}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def fallback(self, product, persona, tone, cta):
+        """``generate_fallback_copy`` through the same cache as model output."""
+        with metrics.timed("copy.template"):
+            if self.cache is None:
+                return generate_fallback_copy(product, persona, tone, cta)
+            product = normalize_product(product)
+            key = self._cache_key("template", product=product, persona=persona, tone=tone, cta=cta)
+            text = self.cache.get(key)
+            if text is None:
+                text = generate_fallback_copy(product, persona, tone, cta)
+                self.cache.put(key, text)
+            return text
+
+    def _accept(self, text, product, persona, tone, cta):
+        # If AI didn't follow format, use fallback
+        return text if "Subject:" in text else self.fallback(product, persona, tone, cta)
+
+    def generate_batch(self, product, personas, tone, cta, num_return_sequences=1, use_ai=True, seed=None):
+        """Write emails for several personas in one padded ``generate`` call.
+
+        Returns ``(results, stats)``: ``results`` holds one ``(persona, text, error)``
+        per persona and returned sequence, and ``stats`` reports latency,
+        generated tokens/sec and whether the request was served from cache.
+        Sampling is only reproducible, and therefore only cached, when ``seed``
+        is given.
+        """
+        start = time.perf_counter()
+        # Beam sampling can return at most num_beams sequences per prompt
+        n = max(1, min(num_return_sequences, GENERATION_KWARGS["num_beams"]))
+        if not (use_ai and self.model_loaded):
+            results = [(p, self.fallback(product, p, tone, cta), None) for p in personas for _ in range(n)]
+            return results, {"latency_ms": (time.perf_counter() - start) * 1000, "new_tokens": 0, "tokens_per_sec": 0.0, "cached": False}
+        key = None
+        if self.cache is not None and seed is not None:
+            # Seeded output depends on the whole batch, so the batch is the cache unit
+            key = self._cache_key("model", product=normalize_product(product), personas=list(personas),
+                                  tone=tone, cta=cta, n=n, seed=seed)
+            hit = self.cache.get(key)
+            if hit is not None:
+                return [tuple(r) + (None,) for r in hit], {
+                    "latency_ms": (time.perf_counter() - start) * 1000, "new_tokens": 0, "tokens_per_sec": 0.0, "cached": True,
+                }
+        try:
+            if seed is not None:
+                from transformers import set_seed
+                set_seed(seed)
+            prompts = [build_prompt(product, p, tone, cta) for p in personas]
+            with metrics.timed("copy.tokenize"):
+                inputs = self.tokenizer(prompts, return_tensors="pt", padding=True, truncation=True, max_length=512).to(self.model.device)
+            with metrics.timed("copy.generate"):
+                outputs = self.model.generate(**inputs, num_return_sequences=n, **GENERATION_KWARGS)
+            texts = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+            new_tokens = int((outputs != self.tokenizer.pad_token_id).sum())
+            metrics.count("copy.new_tokens", new_tokens)
+            # Outputs are grouped per prompt: n sequences for personas[0], then personas[1], ...
+            results = [(p, self._accept(texts[i * n + j], product, p, tone, cta), None) for i, p in enumerate(personas) for j in range(n)]
+            if key is not None:
+                self.cache.put(key, [[p, text] for p, text, _ in results])
+        except Exception as e:
+            # Same shape as a successful call: n entries per persona
+            results = [(p, self.fallback(product, p, tone, cta), e) for p in personas for _ in range(n)]
+            new_tokens = 0
+        elapsed = time.perf_counter() - start
+        return results, {
+            "latency_ms": elapsed * 1000,
+            "new_tokens": new_tokens,
+            "tokens_per_sec": new_tokens / elapsed if elapsed else 0.0,
+            "cached": False,
+        }
+
+    def generate_stream(self, product, persona, tone, cta, sample=False, stats=None):
+        """Yield the email as text pieces while it is decoded.
+
+        Uses greedy (or, with ``sample=True``, nucleus-sampled) decoding instead
+        of beam search so tokens can be shown as soon as they exist. If given,
+        ``stats`` is filled with ``ttft_ms``, ``latency_ms``, ``new_tokens`` and
+        ``tokens_per_sec`` once the stream is exhausted.
+        """
+        stats = {} if stats is None else stats
+        start = time.perf_counter()
+        if not self.model_loaded:
+            text = self.fallback(product, persona, tone, cta)
+            stats.update(ttft_ms=(time.perf_counter() - start) * 1000, latency_ms=(time.perf_counter() - start) * 1000,
+                         new_tokens=0, tokens_per_sec=0.0)
+            yield text
+            return
+        from transformers import TextIteratorStreamer
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        inputs = self.tokenizer(build_prompt(product, persona, tone, cta), return_tensors="pt", truncation=True, max_length=512).to(self.model.device)
+        kwargs = dict(**inputs, streamer=streamer, max_new_tokens=GENERATION_KWARGS["max_new_tokens"], do_sample=sample)
+        if sample:
+            kwargs.update(temperature=GENERATION_KWARGS["temperature"], top_p=GENERATION_KWARGS["top_p"])
+        errors = []
+
+        def run():
+            try:
+                self.model.generate(**kwargs)
+            except Exception as e:
+                # Unblock the consumer instead of leaving it waiting on the queue
+                errors.append(e)
+                streamer.end()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        pieces = []
+        for piece in streamer:
+            if piece and "ttft_ms" not in stats:
+                stats["ttft_ms"] = (time.perf_counter() - start) * 1000
+            pieces.append(piece)
+            yield piece
+        thread.join()
+        if errors:
+            raise errors[0]
+        elapsed = time.perf_counter() - start
+        new_tokens = len(self.tokenizer("".join(pieces), add_special_tokens=False).input_ids)
+        stats.setdefault("ttft_ms", elapsed * 1000)
+        metrics.observe("copy.stream_ttft", stats["ttft_ms"])
+        metrics.observe("copy.stream", elapsed * 1000)
+        metrics.count("copy.new_tokens", new_tokens)
+        stats.update(latency_ms=elapsed * 1000, new_tokens=new_tokens, tokens_per_sec=new_tokens / elapsed if elapsed else 0.0)
+
+    def generate(self, product, persona, tone, cta, use_ai=True, seed=None):
+        """Return ``(text, error)``; ``error`` is set when AI generation failed and the template was used."""
+        results, _ = self.generate_batch(product, [persona], tone, cta, use_ai=use_ai, seed=seed)
+        _, text, error = results[0]
+        return text, error
@@ -0,0 +1,147 @@
+import contextlib
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+from enterprise_ai import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads within one process are serialized
+    fcntl = None
+
+
+class EmbeddingStore:
+    """Append-only on-disk cache of chunk embeddings.
+
+    Vectors live in a raw float16 file that is memory-mapped on read, and each
+    row is keyed by a hash of the model name plus the chunk text. Chunks that
+    were embedded before (by this or any earlier process) are never re-encoded.
+
+    Row ``i`` of ``vectors.f16`` belongs to line ``i`` of ``keys.txt``. Appends
+    happen under an OS file lock, so several processes (the app and the API
+    server, or multiple workers) can share one directory; each instance picks
+    up rows written by the others before deciding a chunk is missing.
+    """
+
+    def __init__(self, root, model_name):
+        self.model_name = model_name
+        self.dir = os.path.join(root, re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name))
+        self._meta_path = os.path.join(self.dir, "meta.json")
+        self._keys_path = os.path.join(self.dir, "keys.txt")
+        self._vecs_path = os.path.join(self.dir, "vectors.f16")
+        self._lock_path = os.path.join(self.dir, ".lock")
+        self._lock = threading.Lock()
+        self.dim = None
+        self._rows = {}
+        self._n_rows = 0     # lines of keys.txt consumed so far (== rows with a vector)
+        self._keys_pos = 0   # byte offset just past the last consumed line
+        self._mmap = None
+        self.hits = self.misses = 0
+        with self._lock:
+            self._sync()
+        metrics.register_cache("embedding_store", self)
+
+    def key(self, text):
+        return hashlib.sha1(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"size": len(self._rows), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        os.makedirs(self.dir, exist_ok=True)
+        with open(self._lock_path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _sync(self):
+        """Pick up rows appended since the last sync, by this or any other process.
+
+        Only complete key lines that have a vector row are consumed, so a
+        writer caught mid-append (or a crashed one) is never read.
+        """
+        if self.dim is None:
+            if not os.path.exists(self._meta_path):
+                return
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                self.dim = json.load(f)["dim"]
+        if not os.path.exists(self._keys_path):
+            return
+        n_vecs = os.path.getsize(self._vecs_path) // (self.dim * 2) if os.path.exists(self._vecs_path) else 0
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._keys_pos)
+            for line in f:
+                if not line.endswith(b"\n") or self._n_rows >= n_vecs:
+                    break
+                self._keys_pos += len(line)
+                key = line.decode("ascii").strip()
+                if key:
+                    self._rows[key] = self._n_rows
+                self._n_rows += 1
+
+    def _repair(self):
+        # Called under the file lock after a sync: anything past the consumed rows
+        # is left over from a crashed writer, e.g. a vector whose key never landed
+        if os.path.exists(self._keys_path) and os.path.getsize(self._keys_path) > self._keys_pos:
+            os.truncate(self._keys_path, self._keys_pos)
+        if os.path.exists(self._vecs_path) and os.path.getsize(self._vecs_path) > self._n_rows * self.dim * 2:
+            os.truncate(self._vecs_path, self._n_rows * self.dim * 2)
+
+    def _vectors(self):
+        n = self._n_rows
+        if self._mmap is None or self._mmap.shape[0] != n:
+            self._mmap = np.memmap(self._vecs_path, dtype=np.float16, mode="r", shape=(n, self.dim))
+        return self._mmap
+
+    def _append(self, keys, vecs):
+        vecs = np.asarray(vecs, dtype=np.float16)
+        with self._file_lock():
+            self._sync()
+            if self.dim is None:
+                self.dim = int(vecs.shape[1])
+                with open(self._meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"model": self.model_name, "dim": self.dim}, f)
+            # Another process may have stored some of these meanwhile
+            fresh = [i for i, k in enumerate(keys) if k not in self._rows]
+            if not fresh:
+                return
+            self._repair()
+            # Vectors first: a crash in between leaves an orphan vector, never a key without one
+            with open(self._vecs_path, "ab") as f:
+                f.write(vecs[fresh].tobytes())
+            with open(self._keys_path, "a", encoding="utf-8") as f:
+                f.write("".join(keys[i] + "\n" for i in fresh))
+            self._sync()
+
+    def encode(self, texts, encode_fn):
+        """Return float32 embeddings for ``texts``, calling ``encode_fn`` only for unseen chunks."""
+        keys = [self.key(t) for t in texts]
+        with self._lock:
+            self._sync()
+            missing = {}
+            for k, t in zip(keys, texts):
+                if k not in self._rows and k not in missing:
+                    missing[k] = t
+            self.misses += len(missing)
+            self.hits += len(keys) - len(missing)
+            if missing:
+                # The model runs outside the file lock; only the append is serialized
+                self._append(list(missing), encode_fn(list(missing.values())))
+            if not keys:
+                return np.zeros((0, self.dim or 0), dtype=np.float32)
+            return np.asarray(self._vectors()[[self._rows[k] for k in keys]], dtype=np.float32)
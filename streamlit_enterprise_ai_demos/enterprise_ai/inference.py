@@ -0,0 +1,70 @@
+"""CPU inference modes shared by the MiniLM encoder and the flan-t5 generator.
+
+- ``fp32``: the stock weights.
+- ``int8``: dynamic int8 quantization of every ``nn.Linear``.
+- ``bf16``: bfloat16 weights, only offered when the CPU has native bf16 support.
+
+The intra-op thread count is process-wide; set it once with
+``ENTERPRISE_AI_THREADS`` (the default mode can be set with ``ENTERPRISE_AI_INFERENCE``).
+``python -m benchmarks.bench_inference`` sweeps thread counts per mode and
+reports the fastest one for this machine.
+"""
+import os
+
+MODES = ("fp32", "int8", "bf16")
+DEFAULT_MODE = os.environ.get("ENTERPRISE_AI_INFERENCE", "fp32")
+
+
+def bf16_supported():
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return any(flag in flags for flag in ("avx512_bf16", "amx_bf16"))
+
+
+def available_modes():
+    return [m for m in MODES if m != "bf16" or bf16_supported()]
+
+
+def configure_threads(threads=None):
+    """Set torch's intra-op thread count (from ``ENTERPRISE_AI_THREADS`` if not given)."""
+    threads = threads or int(os.environ.get("ENTERPRISE_AI_THREADS", 0))
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+
+
+def optimize(module, mode):
+    """Return ``module`` converted for the given CPU inference mode."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown inference mode: {mode}")
+    if mode == "fp32":
+        return module
+    import torch
+    if mode == "int8":
+        return torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+    return module.to(torch.bfloat16)
+
+
+def load_sentence_model(model_name, mode=DEFAULT_MODE, threads=None):
+    from sentence_transformers import SentenceTransformer
+    configure_threads(threads)
+    device = None if mode == "fp32" else "cpu"
+    return optimize(SentenceTransformer(model_name, device=device), mode)
+
+
+def load_seq2seq(model_name, mode=DEFAULT_MODE, threads=None):
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+    configure_threads(threads)
+    tok = AutoTokenizer.from_pretrained(model_name)
+    if mode == "fp32":
+        return tok, AutoModelForSeq2SeqLM.from_pretrained(model_name, device_map="auto")
+    # Quantized and bf16 kernels are CPU-only
+    return tok, optimize(AutoModelForSeq2SeqLM.from_pretrained(model_name).eval(), mode)
+
+
+def store_name(model_name, mode):
+    """Embedding-store key: quantized vectors are not mixed with full-precision ones."""
+    return model_name if mode == "fp32" else f"{model_name}@{mode}"
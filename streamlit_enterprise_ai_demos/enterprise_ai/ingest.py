@@ -0,0 +1,122 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from enterprise_ai import metrics
+
+
+def discover_files(docs_dir, ext=".txt"):
+    """Yield ``(name, path)`` for every matching file, without reading anything."""
+    with os.scandir(docs_dir) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.is_file() and entry.name.endswith(ext):
+                yield entry.name, entry.path
+
+
+def read_path(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def decode_bytes(data):
+    return data.decode("utf-8", errors="ignore")
+
+
+def approx_tokens(text):
+    """Cheap WordPiece-style token estimate (~1.3 tokens per word).
+
+    Thread-safe, unlike sharing a fast tokenizer across the worker pool.
+    """
+    return int(len(text.split()) * 1.3) + 1
+
+
+def _split_line(line, limit, length):
+    # Cut a line at word boundaries into pieces shorter than ``limit``; a single
+    # word that is longer still becomes its own piece
+    words = line.split()
+    pieces, start = [], 0
+    while start < len(words):
+        lo, hi = start + 1, len(words)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if length(" ".join(words[start:mid])) < limit:
+                lo = mid
+            else:
+                hi = mid - 1
+        pieces.append(" ".join(words[start:lo]))
+        start = lo
+    return pieces
+
+
+def chunk_text(text, max_size=600, overlap=0, length=len):
+    """Greedy line-packing chunker.
+
+    ``length`` measures a line (characters by default, or tokens via
+    ``approx_tokens``); ``overlap`` repeats the last N lines of a chunk at the
+    start of the next one. Lines too long for a chunk are split at word
+    boundaries first, into halves of ``max_size`` when overlapping so a piece
+    and its repeated neighbour still fit together.
+    """
+    limit = max(max_size // 2, 1) if overlap else max_size
+    parts = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        parts.extend(_split_line(line, limit, length) if length(line) >= max_size else [line])
+    chunks, cur, sizes = [], [], []
+    for p in parts:
+        n = length(p)
+        if cur and sum(sizes) + n >= max_size:
+            chunks.append(" ".join(cur))
+            cur, sizes = (cur[-overlap:], sizes[-overlap:]) if overlap else ([], [])
+            while cur and sum(sizes) + n >= max_size:
+                cur.pop(0)
+                sizes.pop(0)
+        cur.append(p)
+        sizes.append(n)
+    if cur:
+        chunks.append(" ".join(cur))
+    return chunks
+
+
+def _load_and_chunk(source, chunk_kwargs):
+    name, load = source
+    try:
+        with metrics.timed("ingest.read"):
+            text = load()
+        with metrics.timed("ingest.chunk"):
+            return name, chunk_text(text, **chunk_kwargs), None
+    except Exception as e:
+        return name, [], e
+
+
+def iter_chunks(sources, workers=4, on_error=None, **chunk_kwargs):
+    """Read and chunk ``(name, load_fn)`` sources on a thread pool, yielding ``(name, chunk)``.
+
+    At most ``2 * workers`` documents are in flight at once, so memory stays
+    bounded no matter how many sources there are. Order follows ``sources``.
+    """
+    sources = iter(sources)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque(pool.submit(_load_and_chunk, s, chunk_kwargs) for s in islice(sources, 2 * workers))
+        while pending:
+            name, chunks, err = pending.popleft().result()
+            for s in islice(sources, 1):
+                pending.append(pool.submit(_load_and_chunk, s, chunk_kwargs))
+            if err is not None:
+                if on_error:
+                    on_error(name, err)
+                continue
+            for c in chunks:
+                yield name, c
+
+
+def batched(iterable, size):
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,328 @@
+import hashlib
+import heapq
+import json
+import math
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from enterprise_ai import metrics
+
+NUM_COLS = ["EngagementLevel", "PagesViewed", "RequestedPricing"]
+CAT_COLS = ["CompanySize", "Industry", "LeadSource", "Region"]
+STRONG_SOURCES = ("Referral", "Conference", "Webinar")
+LARGE_COMPANIES = ("Enterprise", "Mid-Market")
+# Compact dtypes for reading large exports: categoricals instead of Python strings.
+# Numerics are parsed as nullable ints so blank cells don't fail the read.
+CSV_DTYPES = {
+    "CompanySize": "category",
+    "Industry": "category",
+    "LeadSource": "category",
+    "Region": "category",
+    "EngagementLevel": "Int8",
+    "PagesViewed": "Int16",
+    "RequestedPricing": "Int8",
+}
+
+
+def build_pipeline():
+    pre = ColumnTransformer([
+        ("num", "passthrough", NUM_COLS),
+        ("cat", OneHotEncoder(handle_unknown="ignore"), CAT_COLS),
+    ])
+    return Pipeline([
+        ("pre", pre),
+        ("lr", LogisticRegression(max_iter=1000)),
+    ])
+
+
+def _column(df, name, default):
+    return df[name] if name in df.columns else pd.Series(default, index=df.index)
+
+
+def synthetic_labels(df, seed=42):
+    """Heuristic ``did_convert`` labels for demo data that has no outcomes."""
+    rng = np.random.default_rng(seed)
+    base = (
+        _column(df, "EngagementLevel", 0).to_numpy(dtype=float) * 0.8
+        + np.minimum(_column(df, "PagesViewed", 0).to_numpy(dtype=float), 15) * 0.2
+        + np.where(_column(df, "RequestedPricing", 0).to_numpy() == 1, 2.0, 0.0)
+        + np.where(_column(df, "CompanySize", "").isin(LARGE_COMPANIES).to_numpy(), 1.5, 0.5)
+        + np.where(_column(df, "LeadSource", "").isin(STRONG_SOURCES).to_numpy(), 1.0, 0.0)
+    )
+    prob = 1 / (1 + np.exp(-(base - base.mean()) / 2.0))
+    return (prob > rng.random(len(prob))).astype(int)
+
+
+# (column, test, label) reasons; tests work on scalars and on Series
+FLAG_REASONS = [
+    ("RequestedPricing", lambda v: v == 1, "Requested pricing → high intent"),
+    ("EngagementLevel", lambda v: v >= 4, "High engagement level"),
+    ("PagesViewed", lambda v: v >= 10, "Multiple page views"),
+]
+# (column, qualifying values, label prefix) reasons that name the value
+VALUE_REASONS = [
+    ("LeadSource", STRONG_SOURCES, "Strong source: "),
+    ("CompanySize", LARGE_COMPANIES, "Company size: "),
+]
+
+
+def _reason_parts(df):
+    """``(labels, codes)`` per reason; ``codes`` index ``labels`` and are -1 where the reason does not apply."""
+    parts = []
+    for col, test, label in FLAG_REASONS:
+        if col in df.columns:
+            parts.append(([label], np.where(test(df[col]).to_numpy(), 0, -1)))
+    for col, strong, prefix in VALUE_REASONS:
+        if col in df.columns:
+            # Work on the few distinct values rather than on every row's string
+            codes, uniques = pd.factorize(df[col])
+            keep = np.append(np.isin(np.asarray(uniques, dtype=str), strong), False)
+            parts.append(([prefix + str(u) for u in uniques], np.where(keep[codes], codes, -1)))
+    return parts
+
+
+def explain(df):
+    """``"; "``-joined reasons for every row, built from column masks."""
+    parts = _reason_parts(df)
+    if not parts:
+        return pd.Series("", index=df.index, dtype=object)
+    # Only a handful of reason combinations exist; join each once and broadcast
+    key = np.zeros(len(df), dtype=np.int64)
+    for labels, codes in parts:
+        key = key * (len(labels) + 1) + codes + 1
+    combos, inverse = np.unique(key, return_inverse=True)
+    joined = []
+    for combo in combos:
+        reasons = []
+        for labels, _ in reversed(parts):
+            combo, code = divmod(combo, len(labels) + 1)
+            if code:
+                reasons.append(labels[code - 1])
+        joined.append("; ".join(reversed(reasons)))
+    return pd.Series(np.array(joined, dtype=object)[inverse], index=df.index)
+
+
+def lead_reasons(lead):
+    """Reasons for a single lead given as a dict."""
+    reasons = [label for col, test, label in FLAG_REASONS if col in lead and test(lead[col])]
+    reasons += [prefix + str(lead[col]) for col, strong, prefix in VALUE_REASONS if col in lead and lead[col] in strong]
+    return reasons
+
+
+def features(df):
+    return df.drop(columns=[c for c in ["did_convert", "Name"] if c in df.columns])
+
+
+class LeadScoringMixin:
+    """``score()`` for any scorer that provides ``predict(df)`` probabilities."""
+
+    def score(self, df, sort=True):
+        """Return a ``Name``/``Score``/``Reasons`` frame, sorted by score unless ``sort=False``."""
+        if "Name" in df.columns:
+            names = df["Name"]
+        else:
+            names = "Lead " + pd.Series(df.index + 1, index=df.index).astype(str)
+        scores = np.round(self.predict(df), 3)
+        with metrics.timed("leads.explain"):
+            reasons = explain(df)
+        metrics.count("leads.scored_rows", len(df))
+        out = pd.DataFrame({"Name": names, "Score": scores, "Reasons": reasons}, index=df.index)
+        return out.sort_values("Score", ascending=False) if sort else out
+
+
+class LeadScorer(LeadScoringMixin):
+    """Explainable lead scorer: fit once, then score frames or single leads."""
+
+    # Bump when the pickled attributes change (e.g. the compiled weights used by
+    # score_one), so registry entries written by older code are refitted
+    FORMAT_VERSION = 2
+
+    def __init__(self):
+        self.clf = build_pipeline()
+
+    def fit(self, df):
+        df = df.copy()
+        if "did_convert" not in df.columns:
+            df["did_convert"] = synthetic_labels(df)
+        with metrics.timed("leads.fit"):
+            self.clf.fit(features(df), df["did_convert"])
+        self._compile()
+        return self
+
+    def _compile(self):
+        # Flatten the fitted one-hot + logistic pipeline into plain weight lookups so
+        # single leads skip DataFrame construction and the ColumnTransformer
+        coef = self.clf.named_steps["lr"].coef_[0]
+        self._intercept = float(self.clf.named_steps["lr"].intercept_[0])
+        self._num_w = dict(zip(NUM_COLS, coef[:len(NUM_COLS)].tolist()))
+        self._cat_w = {}
+        offset = len(NUM_COLS)
+        for col, cats in zip(CAT_COLS, self.clf.named_steps["pre"].named_transformers_["cat"].categories_):
+            self._cat_w[col] = dict(zip(cats.tolist(), coef[offset:offset + len(cats)].tolist()))
+            offset += len(cats)
+
+    def score_one(self, lead):
+        """Score a single lead given as a dict; returns ``(probability, reasons)``."""
+        metrics.count("leads.scored_one")
+        z = self._intercept
+        z += sum(float(lead[c]) * w for c, w in self._num_w.items())
+        # Unknown categories contribute nothing, as with handle_unknown="ignore"
+        z += sum(weights.get(lead[c], 0.0) for c, weights in self._cat_w.items())
+        return 1.0 / (1.0 + math.exp(-z)), lead_reasons(lead)
+
+    def predict(self, df):
+        """Conversion probabilities for every row, in one ``predict_proba`` call."""
+        with metrics.timed("leads.predict_proba"):
+            return self.clf.predict_proba(features(df))[:, 1]
+
+
+def _fill_numeric(frame):
+    # A blank numeric cell is "no signal": 0, back in the compact non-nullable dtype
+    for col in NUM_COLS:
+        if col in frame.columns:
+            frame[col] = frame[col].fillna(0).astype(CSV_DTYPES[col].lower())
+    return frame
+
+
+def read_leads_csv(src, chunksize=None, **kwargs):
+    """Read a leads CSV with compact dtypes; with ``chunksize``, yield frames.
+
+    Raises ``ValueError`` when a numeric column holds something that isn't a number.
+    """
+    if chunksize is None:
+        return _fill_numeric(pd.read_csv(src, dtype=CSV_DTYPES, **kwargs))
+    return (_fill_numeric(chunk) for chunk in pd.read_csv(src, dtype=CSV_DTYPES, chunksize=chunksize, **kwargs))
+
+
+class _ParquetSink:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from e
+        self.pa, self.pq, self.path = pa, pq, path
+        self.writer = None
+
+    def write(self, frame):
+        # Per-chunk categories differ, so store plain strings for a stable schema
+        frame = frame.astype({c: str for c in frame.columns if isinstance(frame[c].dtype, pd.CategoricalDtype)})
+        if self.writer is None:
+            table = self.pa.Table.from_pandas(frame, preserve_index=False)
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = self.pa.Table.from_pandas(frame, schema=self.writer.schema, preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class _CSVSink:
+    def __init__(self, path):
+        self.f = open(path, "w", encoding="utf-8", newline="")
+        self.header = True
+
+    def write(self, frame):
+        frame.to_csv(self.f, header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        self.f.close()
+
+
+def score_csv(scorer, src, out_path, chunksize=100_000, top_n=20):
+    """Score a leads CSV chunk by chunk without holding it in memory.
+
+    Each scored chunk (inputs plus ``Score`` and ``Reasons``) is appended to
+    ``out_path`` (``.parquet`` or CSV), and a running min-heap keeps the
+    ``top_n`` leads for display. Returns ``(top_frame, rows_scored)``.
+    """
+    sink = _ParquetSink(out_path) if str(out_path).endswith(".parquet") else _CSVSink(out_path)
+    heap, rows = [], 0
+    try:
+        for chunk in read_leads_csv(src, chunksize=chunksize):
+            chunk.index = pd.RangeIndex(rows, rows + len(chunk))
+            scored = scorer.score(chunk, sort=False)
+            with metrics.timed("leads.write"):
+                sink.write(chunk.assign(Score=scored["Score"], Reasons=scored["Reasons"]))
+            # Only a chunk's own top-N can enter the global top-N
+            for row in scored.nlargest(top_n, "Score").itertuples():
+                item = (row.Score, -row.Index, row.Name, row.Reasons)
+                if len(heap) < top_n:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            rows += len(chunk)
+    finally:
+        sink.close()
+    top = sorted(heap, reverse=True)
+    return pd.DataFrame([{"Name": n, "Score": s, "Reasons": r} for s, _, n, r in top], columns=["Name", "Score", "Reasons"]), rows
+
+
+def training_fingerprint(df):
+    """Hash of the training rows plus everything that shapes the fitted pipeline."""
+    h = hashlib.sha256()
+    schema = {
+        "columns": sorted(features(df).columns),
+        "num_cols": NUM_COLS,
+        "cat_cols": CAT_COLS,
+        "labels": "did_convert" if "did_convert" in df.columns else "synthetic",
+        "pipeline": repr(build_pipeline()),
+        "sklearn": sklearn.__version__,
+        "scorer_format": LeadScorer.FORMAT_VERSION,
+    }
+    h.update(json.dumps(schema, sort_keys=True).encode("utf-8"))
+    cols = sorted(c for c in df.columns if c != "Name")
+    h.update(pd.util.hash_pandas_object(df[cols], index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class ModelRegistry:
+    """On-disk store of fitted ``LeadScorer``s keyed by training-data fingerprint."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, fingerprint, ext):
+        return os.path.join(self.root, f"lead_scorer-{fingerprint[:16]}.{ext}")
+
+    def load(self, fingerprint):
+        path = self._path(fingerprint, "joblib")
+        if not os.path.exists(path):
+            return None
+        try:
+            return joblib.load(path)
+        except Exception:
+            # Corrupt or written by an incompatible version: treat as missing
+            return None
+
+    def save(self, scorer, fingerprint, n_rows):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(fingerprint, "joblib")
+        tmp = path + ".tmp"
+        joblib.dump(scorer, tmp)
+        os.replace(tmp, path)
+        meta = {"fingerprint": fingerprint, "rows": n_rows, "created": time.time(), "sklearn": sklearn.__version__}
+        with open(self._path(fingerprint, "json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def load_or_fit(self, df, fingerprint=None):
+        """Return ``(scorer, fingerprint, fitted)``; fits and saves only for unseen training data."""
+        fingerprint = fingerprint or training_fingerprint(df)
+        scorer = self.load(fingerprint)
+        if scorer is not None:
+            return scorer, fingerprint, False
+        scorer = LeadScorer().fit(df)
+        self.save(scorer, fingerprint, len(df))
+        return scorer, fingerprint, True
@@ -0,0 +1,62 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+
+# Keeps amounts like "65,000" or "99.95" as single terms
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.,][0-9]+)*")
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index of ``term -> (doc ids, term freqs)`` arrays."""
+
+    def __init__(self, texts, k1=1.5, b=0.75):
+        self.k1, self.b = k1, b
+        postings = defaultdict(lambda: ([], []))
+        doc_len = np.zeros(len(texts), dtype=np.float32)
+        for doc_id, text in enumerate(texts):
+            terms = Counter(tokenize(text))
+            doc_len[doc_id] = sum(terms.values())
+            for term, tf in terms.items():
+                ids, tfs = postings[term]
+                ids.append(doc_id)
+                tfs.append(tf)
+        self.n_docs = len(texts)
+        avg_len = float(doc_len.mean()) if len(texts) else 0.0
+        # Length normalisation is per document, so fold it in once at build time
+        self._norm = self.k1 * (1 - self.b + self.b * doc_len / max(avg_len, 1e-9))
+        self.postings = {
+            t: (np.asarray(ids, dtype=np.int64), np.asarray(tfs, dtype=np.float32))
+            for t, (ids, tfs) in postings.items()
+        }
+        self.idf = {
+            t: math.log(1 + (self.n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+            for t, (ids, _) in self.postings.items()
+        }
+
+    def __len__(self):
+        return self.n_docs
+
+    def search(self, query, top_k):
+        """Return ``(scores, ids)`` of up to ``top_k`` documents sharing a term with ``query``."""
+        hit_ids, hit_scores = [], []
+        for term in set(tokenize(query)):
+            if term not in self.postings:
+                continue
+            ids, tfs = self.postings[term]
+            hit_ids.append(ids)
+            hit_scores.append(self.idf[term] * tfs * (self.k1 + 1) / (tfs + self._norm[ids]))
+        if not hit_ids:
+            return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.int64)
+        # Only documents in the touched postings lists are scored
+        ids, inverse = np.unique(np.concatenate(hit_ids), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(hit_scores)).astype(np.float32)
+        k = min(top_k, len(ids))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return scores[best], ids[best]
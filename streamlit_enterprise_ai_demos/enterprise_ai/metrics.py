@@ -0,0 +1,240 @@
+"""Process-wide timers, counters and cache stats for the demo hot paths.
+
+Instrumented code wraps a stage in ``with metrics.timed("search.encode"):``
+(or reports an already-measured duration with ``observe``). Each stage keeps a
+count, total, a fixed log-scale histogram and a window of recent samples for
+percentiles. Set ``ENTERPRISE_AI_METRICS=0`` to turn recording off.
+
+``arm_profile`` makes the next page run that calls ``profile_start`` record a
+cProfile dump; the page calls ``profile_finish`` when it is done.
+"""
+import cProfile
+import io
+import os
+import pstats
+import tempfile
+import threading
+import time
+import weakref
+from collections import deque
+
+import numpy as np
+
+ENABLED = os.environ.get("ENTERPRISE_AI_METRICS", "1") != "0"
+
+# Upper bounds (ms) of the histogram buckets; the last one catches everything
+BUCKETS_MS = (0.01, 0.03, 0.1, 0.3, 1, 3, 10, 30, 100, 300, 1_000, 3_000, 10_000, float("inf"))
+RECENT = 2048
+
+_lock = threading.Lock()
+_stages = {}
+_counters = {}
+_caches = {}
+
+
+class _Stage:
+    __slots__ = ("count", "total_ms", "max_ms", "buckets", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * len(BUCKETS_MS)
+        self.recent = deque(maxlen=RECENT)
+
+    def add(self, ms):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[next(i for i, b in enumerate(BUCKETS_MS) if ms <= b)] += 1
+        self.recent.append(ms)
+
+    def summary(self):
+        p50, p95, p99 = np.percentile(self.recent, [50, 95, 99]) if self.recent else (0.0, 0.0, 0.0)
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(self.max_ms, 3),
+            "histogram": {f"<={b:g}ms": n for b, n in zip(BUCKETS_MS, self.buckets) if n},
+        }
+
+
+def observe(stage, ms):
+    """Record one ``ms``-long run of ``stage``."""
+    if not ENABLED:
+        return
+    with _lock:
+        entry = _stages.get(stage)
+        if entry is None:
+            entry = _stages[stage] = _Stage()
+        entry.add(ms)
+
+
+def count(name, n=1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+class timed:
+    """Context manager that records the wrapped block under ``stage``."""
+
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, (time.perf_counter() - self.start) * 1000)
+
+
+def register_cache(name, cache):
+    """Report ``cache.stats()`` under ``name``; caches sharing a name are summed."""
+    with _lock:
+        _caches.setdefault(name, weakref.WeakSet()).add(cache)
+    return cache
+
+
+def _cache_stats(caches):
+    out = {}
+    for cache in list(caches):
+        for k, v in cache.stats().items():
+            if k != "hit_rate":
+                out[k] = out.get(k, 0) + v
+    lookups = out.get("hits", 0) + out.get("disk_hits", 0) + out.get("misses", 0)
+    out["hit_rate"] = round((out.get("hits", 0) + out.get("disk_hits", 0)) / lookups, 4) if lookups else 0.0
+    out["instances"] = len(caches)
+    return out
+
+
+def rss_mb():
+    # Resident set size from /proc; falls back to peak RSS elsewhere
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def model_memory_mb(obj):
+    """Size of a torch model's weights and buffers, or None for anything else.
+
+    Accepts a module or an object holding one in ``.model`` (``CopyGenerator``).
+    Reads the state dict so int8 packed weights are counted too.
+    """
+    module = getattr(obj, "model", None)
+    module = obj if module is None else module
+    if not hasattr(module, "state_dict"):
+        return None
+    total = 0
+    for value in module.state_dict().values():
+        for t in value if isinstance(value, (tuple, list)) else (value,):
+            if hasattr(t, "element_size"):
+                total += t.numel() * t.element_size()
+    return round(total / 2 ** 20, 1)
+
+
+def snapshot():
+    """Everything recorded so far, as plain JSON-serializable data."""
+    from enterprise_ai.models import manager
+    with _lock:
+        stages = {name: s.summary() for name, s in sorted(_stages.items())}
+        counters = dict(sorted(_counters.items()))
+        caches = {name: _cache_stats(c) for name, c in sorted(_caches.items()) if len(c)}
+    models = manager.report()
+    for key, model in manager.loaded():
+        models["models"][str(key)]["weights_mb"] = model_memory_mb(model)
+    return {
+        "enabled": ENABLED,
+        "taken_at": time.time(),
+        "stages": stages,
+        "counters": counters,
+        "caches": caches,
+        "memory": {"rss_mb": round(rss_mb(), 1)},
+        "models": models,
+    }
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+    for caches in list(_caches.values()):
+        for cache in list(caches):
+            cache.hits = cache.misses = 0
+            if hasattr(cache, "evictions"):
+                cache.evictions = 0
+            if hasattr(cache, "disk_hits"):
+                cache.disk_hits = 0
+
+
+class _Profiles:
+    def __init__(self):
+        self.armed = False
+        self.active = None  # (page, profiler, started)
+        self.dumps = deque(maxlen=5)
+        self.lock = threading.Lock()
+
+
+_profiles = _Profiles()
+
+
+def arm_profile():
+    """Profile the next page run that calls ``profile_start``."""
+    _profiles.armed = True
+
+
+def profile_start(page):
+    with _profiles.lock:
+        if not _profiles.armed or _profiles.active is not None:
+            return
+        _profiles.armed = False
+        profiler = cProfile.Profile()
+        _profiles.active = (page, profiler, time.perf_counter(), threading.get_ident())
+    profiler.enable()
+
+
+def profile_finish():
+    """Stop the active profile (if any) and keep its dump.
+
+    Pages call this at the end of a run. A run cut short by ``st.stop()`` or
+    ``st.rerun()`` is collected by the next caller instead, e.g. the
+    Performance page.
+    """
+    with _profiles.lock:
+        if _profiles.active is None:
+            return
+        page, profiler, started, thread = _profiles.active
+        _profiles.active = None
+    profiler.disable()
+    wall_ms = (time.perf_counter() - started) * 1000
+    text = io.StringIO()
+    stats = pstats.Stats(profiler, stream=text)
+    stats.sort_stats("cumulative").print_stats(40)
+    fd, path = tempfile.mkstemp(prefix="enterprise_ai_", suffix=".prof")
+    os.close(fd)
+    stats.dump_stats(path)
+    _profiles.dumps.appendleft({
+        "page": page, "at": time.time(), "wall_ms": round(wall_ms, 1),
+        # Interrupted runs are stopped late, so their wall time includes idle time
+        "interrupted": thread != threading.get_ident(),
+        "text": text.getvalue(), "path": path,
+    })
+
+
+def profile_state():
+    return {"armed": _profiles.armed, "active": _profiles.active[0] if _profiles.active else None}
+
+
+def profile_dumps():
+    return list(_profiles.dumps)
@@ -0,0 +1,176 @@
+"""Process-wide lazy model manager.
+
+Models are loaded on background threads the first time anything asks for
+them, so pages can render (and show a "warming" status) instead of blocking
+on imports and weight loading. Everything here is shared by all sessions in
+the process.
+"""
+import threading
+import time
+
+PROCESS_START = time.perf_counter()
+
+COLD, WARMING, READY, FAILED = "cold", "warming", "ready", "failed"
+# A failed load is retried after RETRY_BASE_S, doubling per consecutive failure up to RETRY_MAX_S
+RETRY_BASE_S = 10
+RETRY_MAX_S = 300
+
+
+class _Entry:
+    def __init__(self, loader):
+        self.loader = loader
+        self.state = COLD
+        self.value = None
+        self.error = None
+        self.started = None
+        self.load_s = None
+        self.rss_delta_mb = None
+        self.failures = 0
+        self.failed_at = None
+        self.ready = threading.Event()
+
+    def retry_due(self):
+        backoff = min(RETRY_BASE_S * 2 ** (self.failures - 1), RETRY_MAX_S)
+        return time.perf_counter() - self.failed_at >= backoff
+
+
+class ModelManager:
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._pages = {}
+
+    def _load(self, key, entry):
+        from enterprise_ai.metrics import rss_mb
+        before = rss_mb()
+        try:
+            entry.value = entry.loader()
+            entry.state, entry.error, entry.failures = READY, None, 0
+        except Exception as e:
+            entry.error, entry.state = e, FAILED
+            entry.failures += 1
+            entry.failed_at = time.perf_counter()
+        entry.load_s = time.perf_counter() - entry.started
+        # Approximate when two models load at once
+        entry.rss_delta_mb = round(rss_mb() - before, 1)
+        entry.ready.set()
+
+    def warm(self, key, loader):
+        """Start loading ``key`` in the background if nobody has yet; returns its state.
+
+        A failed load is started again once its backoff has passed, so a
+        transient error (e.g. a download timeout) doesn't stick until restart.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(loader)
+            if entry.state == COLD or (entry.state == FAILED and entry.retry_due()):
+                if entry.state == FAILED:
+                    entry.ready = threading.Event()
+                entry.state, entry.started = WARMING, time.perf_counter()
+                threading.Thread(target=self._load, args=(key, entry), name=f"warm-{key}", daemon=True).start()
+            return entry.state
+
+    def try_get(self, key, loader):
+        """The loaded model, or None while it is still warming (starts warming if cold).
+
+        Raises the last load error while a failed load waits for its retry.
+        """
+        self.warm(key, loader)
+        entry = self._entries[key]
+        if entry.state == FAILED:
+            raise entry.error
+        return entry.value if entry.state == READY else None
+
+    def get(self, key, loader, timeout=None):
+        """Block until ``key`` is loaded; raises the loader's exception if it failed."""
+        self.warm(key, loader)
+        entry = self._entries[key]
+        if not entry.ready.wait(timeout):
+            raise TimeoutError(f"{key} still warming after {timeout}s")
+        if entry.state == FAILED:
+            raise entry.error
+        return entry.value
+
+    def state(self, key):
+        entry = self._entries.get(key)
+        return entry.state if entry else COLD
+
+    def loaded(self):
+        """``(key, model)`` for every model that finished loading."""
+        return [(key, e.value) for key, e in list(self._entries.items()) if e.state == READY]
+
+    def record_page(self, page, first_render_ms=None, ready_ms=None):
+        """Keep the first observed startup timings for a page."""
+        with self._lock:
+            stats = self._pages.setdefault(page, {})
+            if first_render_ms is not None:
+                stats.setdefault("first_render_ms", round(first_render_ms, 1))
+            if ready_ms is not None:
+                stats.setdefault("ready_ms", round(ready_ms, 1))
+
+    def report(self):
+        models = {
+            str(key): {
+                "state": e.state,
+                "load_s": round(e.load_s, 2) if e.load_s is not None else None,
+                "ready_after_start_s": round(e.started + e.load_s - PROCESS_START, 2) if e.load_s is not None else None,
+                "rss_delta_mb": e.rss_delta_mb,
+                "failures": e.failures,
+                "error": str(e.error) if e.error else None,
+            }
+            for key, e in list(self._entries.items())
+        }
+        return {"models": models, "pages": dict(self._pages)}
+
+
+manager = ModelManager()
+
+
+def _sentence_loader(mode):
+    def load():
+        from enterprise_ai.search import MODEL_NAME, load_sentence_model
+        return load_sentence_model(MODEL_NAME, mode)
+    return load
+
+
+def _copy_loader(mode):
+    def load():
+        from enterprise_ai.copywriter import CopyGenerator
+        gen = CopyGenerator(mode=mode).load()
+        if gen.load_error is not None:
+            raise gen.load_error
+        return gen
+    return load
+
+
+def sentence_model(mode, block=False):
+    key = ("sentence", mode)
+    return manager.get(key, _sentence_loader(mode)) if block else manager.try_get(key, _sentence_loader(mode))
+
+
+def copy_generator(mode, block=False):
+    key = ("copy", mode)
+    return manager.get(key, _copy_loader(mode)) if block else manager.try_get(key, _copy_loader(mode))
+
+
+def warm_defaults():
+    """Kick off background loads of the default search and copy models."""
+    from enterprise_ai.inference import DEFAULT_MODE
+    manager.warm(("sentence", DEFAULT_MODE), _sentence_loader(DEFAULT_MODE))
+    manager.warm(("copy", DEFAULT_MODE), _copy_loader(DEFAULT_MODE))
+
+
+def track_startup(page, session_state, run_start, ready):
+    """Record a page's time-to-first-render and time-to-ready as seen by one session.
+
+    ``run_start`` is ``time.perf_counter()`` taken at the top of the script;
+    call this once the page's controls have been emitted.
+    """
+    key = f"_startup_{page}"
+    if key not in session_state:
+        session_state[key] = run_start
+        manager.record_page(page, first_render_ms=(time.perf_counter() - run_start) * 1000)
+    if ready:
+        manager.record_page(page, ready_ms=(time.perf_counter() - session_state[key]) * 1000)
@@ -0,0 +1,105 @@
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.linear_model import SGDClassifier
+from sklearn.utils import murmurhash3_32
+
+from enterprise_ai import metrics
+from enterprise_ai.leads import CAT_COLS, NUM_COLS, LeadScoringMixin, lead_reasons, synthetic_labels
+
+# Fixed scales keep SGD well-conditioned without a fitted scaler
+NUM_SCALE = {"EngagementLevel": 5.0, "PagesViewed": 20.0, "RequestedPricing": 1.0}
+# Hashed in place of None/NaN/NA, the same way in the batch and single-lead paths
+MISSING = "<missing>"
+
+
+class HashedLeadEncoder:
+    """Stateless encoder: scaled numerics plus hashed ``column=value`` one-hots.
+
+    Nothing is learned from the data, so unseen industries or regions map to a
+    bucket instead of forcing a refit.
+    """
+
+    def __init__(self, n_buckets=2 ** 12):
+        self.n_buckets = n_buckets
+        self.n_features = len(NUM_COLS) + n_buckets
+
+    def _bucket(self, col, value):
+        if pd.isna(value):
+            value = MISSING
+        return len(NUM_COLS) + murmurhash3_32(f"{col}={value}", seed=0, positive=True) % self.n_buckets
+
+    def transform(self, df):
+        n = len(df)
+        num = np.column_stack([df[c].to_numpy(dtype=np.float64) / NUM_SCALE[c] for c in NUM_COLS])
+        rows = [np.repeat(np.arange(n), len(NUM_COLS))]
+        cols = [np.tile(np.arange(len(NUM_COLS)), n)]
+        vals = [num.ravel()]
+        for c in CAT_COLS:
+            # Hash each distinct value once, then broadcast by code
+            codes, uniques = pd.factorize(df[c])
+            # factorize gives missing values code -1, i.e. the last entry
+            buckets = np.array([self._bucket(c, u) for u in uniques] + [self._bucket(c, MISSING)], dtype=np.int64)
+            rows.append(np.arange(n))
+            cols.append(buckets[codes])
+            vals.append(np.ones(n))
+        return sparse.csr_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(n, self.n_features),
+        )
+
+    def transform_one(self, lead):
+        x = np.zeros(self.n_features)
+        for c in NUM_COLS:
+            x[NUM_COLS.index(c)] = float(lead[c]) / NUM_SCALE[c]
+        for c in CAT_COLS:
+            x[self._bucket(c, lead[c])] += 1.0
+        return x
+
+
+class OnlineLeadScorer(LeadScoringMixin):
+    """SGD logistic lead scorer that learns from mini-batches of new outcomes."""
+
+    def __init__(self, n_buckets=2 ** 12, alpha=1e-4, seed=0):
+        self.encoder = HashedLeadEncoder(n_buckets)
+        self.clf = SGDClassifier(loss="log_loss", alpha=alpha, random_state=seed)
+        self.n_seen = 0
+        self._lock = threading.Lock()
+
+    def _labels(self, df):
+        return df["did_convert"].to_numpy() if "did_convert" in df.columns else synthetic_labels(df)
+
+    def fit(self, df, epochs=5, batch_size=1024):
+        """Initial training: a few shuffled passes of ``partial_fit`` over ``df``."""
+        X, y = self.encoder.transform(df), self._labels(df)
+        rng = np.random.default_rng(0)
+        with metrics.timed("leads.online_fit"):
+            for _ in range(epochs):
+                order = rng.permutation(len(y))
+                for start in range(0, len(y), batch_size):
+                    idx = order[start:start + batch_size]
+                    self.clf.partial_fit(X[idx], y[idx], classes=[0, 1])
+        self.n_seen = len(y)
+        return self
+
+    def update(self, df):
+        """Learn from newly labelled leads (needs a ``did_convert`` column)."""
+        if "did_convert" not in df.columns:
+            raise ValueError("update() needs a did_convert column with observed outcomes")
+        X, y = self.encoder.transform(df), df["did_convert"].to_numpy()
+        with self._lock, metrics.timed("leads.online_update"):
+            self.clf.partial_fit(X, y, classes=[0, 1])
+            self.n_seen += len(y)
+        return self
+
+    def predict(self, df):
+        with metrics.timed("leads.online_predict_proba"):
+            return self.clf.predict_proba(self.encoder.transform(df))[:, 1]
+
+    def score_one(self, lead):
+        metrics.count("leads.scored_one")
+        z = float(self.clf.decision_function(self.encoder.transform_one(lead)[None, :])[0])
+        return 1.0 / (1.0 + math.exp(-z)), lead_reasons(lead)
@@ -0,0 +1,125 @@
+import time
+
+import numpy as np
+
+from enterprise_ai.cache import LRUCache
+
+# mode -> label shown in the UI
+MODES = {
+    "hybrid": "Hybrid (BM25 candidates, dense rerank)",
+    "rrf": "Hybrid (reciprocal rank fusion)",
+    "dense": "Dense only",
+    "lexical": "Lexical only (BM25)",
+}
+
+
+class _Timer:
+    def __init__(self, timings, stage):
+        self.timings, self.stage = timings, stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timings[self.stage] = (time.perf_counter() - self.start) * 1000
+
+
+def normalize_query(text):
+    return " ".join(text.lower().split())
+
+
+class QueryEncoder:
+    """Caches query embeddings so repeated questions skip the model.
+
+    ``encode_batch`` maps a list of strings to an ``(n, dim)`` array of
+    normalized embeddings.
+    """
+
+    def __init__(self, encode_batch, maxsize=4096, ttl=None):
+        self.encode_batch = encode_batch
+        self.cache = LRUCache(maxsize, ttl)
+
+    def __call__(self, text):
+        return self.encode_many([text])
+
+    def encode_many(self, texts):
+        keys = [normalize_query(t) for t in texts]
+        cached = [self.cache.get(k) for k in keys]
+        missing = list(dict.fromkeys(k for k, v in zip(keys, cached) if v is None))
+        if missing:
+            # All misses go to the model in one batch
+            fresh = dict(zip(missing, np.asarray(self.encode_batch(missing), dtype=np.float32)))
+            for k, emb in fresh.items():
+                self.cache.put(k, emb)
+            cached = [v if v is not None else fresh[k] for k, v in zip(keys, cached)]
+        return np.stack(cached)
+
+
+def search_batch(queries, encoder, index, top_k, **index_kwargs):
+    """Dense top-k for many queries: one encode batch and one matrix multiply.
+
+    ``encoder`` is a ``QueryEncoder`` (or any object with ``encode_many``).
+    Returns a list of ``(scores, ids)`` pairs, one per query. Usable without
+    Streamlit, e.g. from batch evaluation jobs.
+    """
+    if not queries:
+        return []
+    scores, ids = index.search(encoder.encode_many(queries), top_k, **index_kwargs)
+    return [(s[i >= 0], i[i >= 0]) for s, i in zip(scores, ids)]
+
+
+def _rrf(rankings, top_k, k=60):
+    fused = {}
+    for ids in rankings:
+        for rank, doc_id in enumerate(ids):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    best = sorted(fused.items(), key=lambda kv: -kv[1])[:top_k]
+    return (np.array([s for _, s in best], dtype=np.float32),
+            np.array([d for d, _ in best], dtype=np.int64))
+
+
+def search(query, mode, top_k, bm25, index, encode, candidates=100, rrf_k=60, **index_kwargs):
+    """Run one query in the given retrieval mode.
+
+    ``encode`` maps a string to a ``(1, dim)`` normalized embedding and is only
+    called by modes that need it. Returns ``(scores, ids, timings_ms)``.
+    """
+    timings = {}
+    if mode == "lexical":
+        with _Timer(timings, "bm25"):
+            scores, ids = bm25.search(query, top_k)
+    elif mode == "dense":
+        with _Timer(timings, "encode"):
+            q_emb = encode(query)
+        with _Timer(timings, "dense"):
+            scores, ids = index.search(q_emb, top_k, **index_kwargs)
+            scores, ids = scores[0], ids[0]
+    elif mode == "hybrid":
+        with _Timer(timings, "bm25"):
+            _, cand = bm25.search(query, candidates)
+        with _Timer(timings, "encode"):
+            q_emb = encode(query)
+        with _Timer(timings, "dense"):
+            if len(cand):
+                # Dense scores only for the lexical candidate set
+                sims = index.vectors(cand) @ q_emb[0]
+                best = np.argsort(-sims)[:top_k]
+                scores, ids = sims[best], cand[best]
+            else:
+                # No shared terms: fall back to the full vector index
+                scores, ids = index.search(q_emb, top_k, **index_kwargs)
+                scores, ids = scores[0], ids[0]
+    elif mode == "rrf":
+        with _Timer(timings, "bm25"):
+            _, lex_ids = bm25.search(query, candidates)
+        with _Timer(timings, "encode"):
+            q_emb = encode(query)
+        with _Timer(timings, "dense"):
+            _, dense_ids = index.search(q_emb, candidates, **index_kwargs)
+        with _Timer(timings, "fusion"):
+            scores, ids = _rrf([lex_ids.tolist(), [i for i in dense_ids[0].tolist() if i >= 0]], top_k, rrf_k)
+    else:
+        raise ValueError(f"Unknown retrieval mode: {mode}")
+    timings["total"] = sum(timings.values())
+    keep = ids >= 0
+    return scores[keep], ids[keep], timings
@@ -0,0 +1,120 @@
+import hashlib
+import threading
+
+import numpy as np
+
+from enterprise_ai import inference, metrics
+from enterprise_ai.cache import LRUCache
+from enterprise_ai.embedding_store import EmbeddingStore
+from enterprise_ai.ingest import approx_tokens, batched, iter_chunks
+from enterprise_ai.lexical_index import BM25Index
+from enterprise_ai.retrieval import QueryEncoder, normalize_query, search, search_batch
+from enterprise_ai.vector_index import build_index as build_vector_index
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+CHUNK_TOKENS = 128   # MiniLM was trained on 128-token inputs
+CHUNK_OVERLAP = 1    # lines repeated between neighbouring chunks
+ENCODE_BATCH = 64
+
+
+def load_sentence_model(model_name=MODEL_NAME, mode=inference.DEFAULT_MODE):
+    return inference.load_sentence_model(model_name, mode)
+
+
+class DocumentIndex:
+    """Long-lived semantic + lexical index over a set of documents.
+
+    Build it once per corpus and keep it around; queries only pay for encoding
+    (cached) and scoring.
+    """
+
+    def __init__(self, model, store, query_cache_size=4096, result_cache_size=1024, cache_ttl=3600):
+        self.model = model
+        self.store = store
+        self.encoder = QueryEncoder(self._encode, maxsize=query_cache_size, ttl=cache_ttl)
+        self.results = LRUCache(maxsize=result_cache_size, ttl=cache_ttl)
+        metrics.register_cache("search.query_embeddings", self.encoder.cache)
+        metrics.register_cache("search.results", self.results)
+        self.files, self.texts = [], []
+        self.embs = np.zeros((0, 0), dtype=np.float32)
+        self.bm25 = None
+        self.version = None
+        self._vector_indexes = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, cache_dir, model_name=MODEL_NAME, mode=inference.DEFAULT_MODE, **kwargs):
+        store = EmbeddingStore(cache_dir, inference.store_name(model_name, mode))
+        return cls(load_sentence_model(model_name, mode), store, **kwargs)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def _encode(self, texts):
+        metrics.count("search.encoded_texts", len(texts))
+        with metrics.timed("search.model_encode"):
+            return self.model.encode(texts, normalize_embeddings=True)
+
+    def build(self, sources, workers=4):
+        """(Re)index ``(name, load_fn)`` sources; returns a list of read-error messages."""
+        with metrics.timed("search.build"):
+            return self._build(sources, workers)
+
+    def _build(self, sources, workers):
+        files, texts, parts, errors = [], [], [], []
+        chunks = iter_chunks(
+            sources,
+            workers=workers,
+            on_error=lambda name, e: errors.append(f"Error reading {name}: {e}"),
+            max_size=CHUNK_TOKENS, overlap=CHUNK_OVERLAP, length=approx_tokens,
+        )
+        # Files are read and chunked on a worker pool and fed to the encoder in
+        # fixed-size batches, so only one batch of raw text is held at a time
+        for batch in batched(chunks, ENCODE_BATCH):
+            names, batch_texts = zip(*batch)
+            files.extend(names)
+            texts.extend(batch_texts)
+            # Only chunks missing from the on-disk store are sent to the model
+            parts.append(self.store.encode(list(batch_texts), self._encode))
+        dim = self.model.get_sentence_embedding_dimension()
+        with self._lock:
+            self.files, self.texts = files, texts
+            self.embs = np.concatenate(parts) if parts else np.zeros((0, dim), dtype=np.float32)
+            self.bm25 = BM25Index(texts)
+            self.version = hashlib.sha1("\0".join(texts).encode("utf-8")).hexdigest()
+            self._vector_indexes = {}
+        self.results.clear()
+        return errors
+
+    def vector_index(self, backend="exact"):
+        with self._lock:
+            if backend not in self._vector_indexes:
+                with metrics.timed(f"search.index_build.{backend}"):
+                    self._vector_indexes[backend] = build_vector_index(self.embs, backend)
+            return self._vector_indexes[backend]
+
+    def _hits(self, scores, ids):
+        return [{"file": self.files[i], "text": self.texts[i], "score": float(s)} for s, i in zip(scores, ids)]
+
+    def search(self, query, mode="dense", top_k=3, backend="exact", nprobe=None, use_cache=True):
+        """Return ``{"results": [...], "timings": {...}, "cached": bool}``."""
+        with metrics.timed("search.query"):
+            key = (normalize_query(query), self.version, backend, nprobe, mode, top_k)
+            if use_cache:
+                hit = self.results.get(key)
+                if hit is not None:
+                    return {**hit, "cached": True}
+            index_kwargs = {"nprobe": nprobe} if backend == "ivf" and nprobe else {}
+            scores, ids, timings = search(query, mode, top_k, self.bm25, self.vector_index(backend), self.encoder, **index_kwargs)
+            for stage, ms in timings.items():
+                if stage != "total":
+                    metrics.observe(f"search.{stage}", ms)
+            out = {"results": self._hits(scores, ids), "timings": timings}
+            if use_cache:
+                self.results.put(key, out)
+            return {**out, "cached": False}
+
+    def search_batch(self, queries, top_k=3, backend="exact", nprobe=None):
+        """Dense top-k for many queries in one encode batch and one matrix multiply."""
+        index_kwargs = {"nprobe": nprobe} if backend == "ivf" and nprobe else {}
+        return [self._hits(s, i) for s, i in search_batch(queries, self.encoder, self.vector_index(backend), top_k, **index_kwargs)]
@@ -0,0 +1,176 @@
+"""Headless asyncio HTTP/JSON entry point over the same objects the pages use.
+
+Run from the app folder::
+
+    python -m enterprise_ai.server --port 8080
+
+Endpoints (all JSON):
+    GET  /health
+    POST /search        {"query", "mode", "top_k", "backend", "nprobe"}
+    POST /search_batch  {"queries", "top_k", "backend", "nprobe"}
+    POST /score         {"leads": [{...}, ...]}
+    POST /generate      {"product", "persona", "tone", "cta", "variants", "samples", "use_ai", "seed"}
+"""
+import argparse
+import asyncio
+import json
+import os
+from functools import partial
+
+import pandas as pd
+
+from enterprise_ai.copywriter import CopyGenerator, variant_personas
+from enterprise_ai.ingest import discover_files, read_path
+from enterprise_ai.leads import LeadScorer
+from enterprise_ai.search import DocumentIndex
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAX_BODY = 10 * 1024 * 1024
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class DemoServices:
+    """Holds the long-lived document index, lead scorer and copy generator."""
+
+    def __init__(self, doc_index=None, scorer=None, generator=None):
+        self.doc_index = doc_index
+        self.scorer = scorer
+        self.generator = generator
+
+    def _require(self, name):
+        obj = getattr(self, name)
+        if obj is None:
+            raise HTTPError(503, f"{name} is not enabled on this server")
+        return obj
+
+    def dispatch(self, method, path, payload):
+        if method == "GET" and path == "/health":
+            return {
+                "status": "ok",
+                "chunks": len(self.doc_index) if self.doc_index else 0,
+                "scorer": self.scorer is not None,
+                "copy_model_loaded": bool(self.generator and self.generator.model_loaded),
+            }
+        if method != "POST":
+            raise HTTPError(405, "method not allowed")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "request body must be a JSON object")
+        if path == "/search":
+            return self._require("doc_index").search(
+                payload["query"], payload.get("mode", "dense"), int(payload.get("top_k", 3)),
+                payload.get("backend", "exact"), payload.get("nprobe"),
+            )
+        if path == "/search_batch":
+            return {"results": self._require("doc_index").search_batch(
+                payload["queries"], int(payload.get("top_k", 3)), payload.get("backend", "exact"), payload.get("nprobe"),
+            )}
+        if path == "/score":
+            scored = self._require("scorer").score(pd.DataFrame(payload["leads"]))
+            return {"leads": scored.to_dict(orient="records")}
+        if path == "/generate":
+            # Every variant (and sample) comes from one batched generate call, as on the page
+            results, stats = self._require("generator").generate_batch(
+                payload.get("product", "cloud backup solution"),
+                variant_personas(payload.get("persona", "CFO"), int(payload.get("variants", 1))),
+                payload.get("tone", "professional"), payload.get("cta", "Book a demo"),
+                num_return_sequences=int(payload.get("samples", 1)), use_ai=payload.get("use_ai", True),
+                seed=payload.get("seed"),
+            )
+            return {
+                "emails": [{"persona": p, "text": text, "error": str(error) if error else None} for p, text, error in results],
+                "stats": stats,
+            }
+        raise HTTPError(404, "not found")
+
+
+async def _read_request(reader):
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    if not request_line:
+        return None
+    method, target, _ = request_line.split(" ", 2)
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY:
+        raise HTTPError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target.split("?", 1)[0], headers, body
+
+
+async def _handle(services, reader, writer):
+    # One request per connection keeps the protocol handling trivial
+    try:
+        try:
+            request = await _read_request(reader)
+            if request is None:
+                return
+            method, path, _, body = request
+            payload = json.loads(body) if body else {}
+            # Model work is blocking; keep the event loop free for other clients
+            status, result = 200, await asyncio.to_thread(services.dispatch, method, path, payload)
+        except HTTPError as e:
+            status, result = e.status, {"error": str(e)}
+        except (ValueError, KeyError) as e:
+            status, result = 400, {"error": f"bad request: {e}"}
+        except Exception as e:
+            status, result = 500, {"error": str(e)}
+        data = json.dumps(result, default=str).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+            + data
+        )
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(services, host="127.0.0.1", port=8080):
+    server = await asyncio.start_server(partial(_handle, services), host, port)
+    print(f"Serving on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def build_services(docs_dir, leads_csv, cache_dir, search=True, leads=True, copy=True):
+    doc_index = scorer = generator = None
+    if search:
+        doc_index = DocumentIndex.create(cache_dir)
+        doc_index.build([(name, partial(read_path, path)) for name, path in discover_files(docs_dir)])
+    if leads:
+        scorer = LeadScorer().fit(pd.read_csv(leads_csv))
+    if copy:
+        generator = CopyGenerator().load()
+    return DemoServices(doc_index, scorer, generator)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--docs", default=os.path.join(APP_DIR, "sample_documents"))
+    ap.add_argument("--leads", default=os.path.join(APP_DIR, "leads.csv"))
+    ap.add_argument("--cache-dir", default=os.path.join(APP_DIR, ".embedding_cache"))
+    ap.add_argument("--no-search", action="store_true")
+    ap.add_argument("--no-leads", action="store_true")
+    ap.add_argument("--no-copy", action="store_true")
+    args = ap.parse_args()
+    services = build_services(
+        args.docs, args.leads, args.cache_dir,
+        search=not args.no_search, leads=not args.no_leads, copy=not args.no_copy,
+    )
+    asyncio.run(serve(services, args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
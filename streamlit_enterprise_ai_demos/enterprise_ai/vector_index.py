@@ -0,0 +1,125 @@
+import numpy as np
+
+
+def _topk(scores, k):
+    """Indices of the ``k`` largest entries of each row, best first."""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int64)
+    if k < scores.shape[1]:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+class ExactIndex:
+    """Brute-force inner product over normalized embeddings with argpartition top-k."""
+
+    name = "exact"
+
+    def __init__(self, embs):
+        self.embs = np.ascontiguousarray(embs, dtype=np.float32)
+
+    def __len__(self):
+        return self.embs.shape[0]
+
+    def vectors(self, ids):
+        return self.embs[ids]
+
+    def search(self, q_embs, top_k):
+        """Return ``(scores, ids)`` arrays of shape ``(n_queries, top_k)``."""
+        q = np.atleast_2d(np.asarray(q_embs, dtype=np.float32))
+        sims = q @ self.embs.T
+        ids = _topk(sims, top_k)
+        return np.take_along_axis(sims, ids, axis=1), ids
+
+
+class IVFIndex:
+    """Inverted-file index: spherical k-means buckets, probing only the closest ``nprobe`` lists.
+
+    Raising ``nprobe`` trades latency for recall; ``nprobe == nlist`` is exact.
+    Vectors are stored contiguously in list order, so probing a list is a slice
+    rather than a gather, and a batch of queries costs one matrix multiply per
+    probed list, shared by every query that probes it.
+    """
+
+    name = "ivf"
+
+    def __init__(self, embs, nlist=None, nprobe=8, n_iter=10, seed=0):
+        embs = np.ascontiguousarray(embs, dtype=np.float32)
+        n = embs.shape[0]
+        self.nlist = max(1, min(n, nlist or int(np.sqrt(n)) or 1))
+        self.nprobe = nprobe
+        self.centroids, assign = self._kmeans(embs, n_iter, seed)
+        # order[p] is the original id stored at packed row p; position is its inverse
+        self.order = np.argsort(assign, kind="stable")
+        self.position = np.empty(n, dtype=np.int64)
+        self.position[self.order] = np.arange(n)
+        self.packed = embs[self.order]
+        self.bounds = np.searchsorted(assign[self.order], np.arange(self.nlist + 1))
+
+    def __len__(self):
+        return self.packed.shape[0]
+
+    def vectors(self, ids):
+        return self.packed[self.position[ids]]
+
+    def _kmeans(self, embs, n_iter, seed):
+        rng = np.random.default_rng(seed)
+        n = embs.shape[0]
+        # Train on a sample so build time stays flat on large corpora
+        train = embs[rng.choice(n, min(n, self.nlist * 64), replace=False)]
+        centroids = train[rng.choice(train.shape[0], self.nlist, replace=False)].copy()
+        for _ in range(n_iter):
+            assign = np.argmax(train @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, train)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            centroids = np.where(empty[:, None], centroids, sums / np.maximum(norms, 1e-12))
+        assign = np.empty(n, dtype=np.int64)
+        for start in range(0, n, 65536):
+            assign[start:start + 65536] = np.argmax(embs[start:start + 65536] @ centroids.T, axis=1)
+        return centroids, assign
+
+    def search(self, q_embs, top_k, nprobe=None):
+        """Return ``(scores, ids)``; rows with fewer candidates than ``top_k`` are padded with id -1."""
+        q = np.atleast_2d(np.asarray(q_embs, dtype=np.float32))
+        nq = q.shape[0]
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        probes = _topk(q @ self.centroids.T, nprobe)
+        # Group (query, list) pairs by list: each probed list is scored once for all its queries
+        flat_lists = probes.ravel()
+        flat_queries = np.repeat(np.arange(nq), probes.shape[1])
+        by_list = np.argsort(flat_lists, kind="stable")
+        lists, starts = np.unique(flat_lists[by_list], return_index=True)
+        sims_parts = [[] for _ in range(nq)]
+        rows_parts = [[] for _ in range(nq)]
+        for c, group in zip(lists, np.split(flat_queries[by_list], starts[1:])):
+            lo, hi = self.bounds[c], self.bounds[c + 1]
+            if lo == hi:
+                continue
+            block = q[group] @ self.packed[lo:hi].T
+            for r, sims in zip(group, block):
+                sims_parts[r].append(sims)
+                rows_parts[r].append(np.arange(lo, hi))
+        scores = np.full((nq, top_k), -np.inf, dtype=np.float32)
+        ids = np.full((nq, top_k), -1, dtype=np.int64)
+        for r in range(nq):
+            if not sims_parts[r]:
+                continue
+            sims = np.concatenate(sims_parts[r])
+            rows = np.concatenate(rows_parts[r])
+            best = _topk(sims[None, :], top_k)[0]
+            scores[r, :len(best)] = sims[best]
+            ids[r, :len(best)] = self.order[rows[best]]
+        return scores, ids
+
+
+BACKENDS = {"exact": ExactIndex, "ivf": IVFIndex}
+
+
+def build_index(embs, backend="exact", **params):
+    return BACKENDS[backend](embs, **params)
@@ -1,8 +1,17 @@
 import streamlit as st
-import os, glob
-import pandas as pd
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import os
+import time
+from functools import partial
+from enterprise_ai import inference, metrics, models
+from enterprise_ai.embedding_store import EmbeddingStore
+from enterprise_ai.ingest import decode_bytes, discover_files, read_path
+from enterprise_ai.retrieval import MODES
+from enterprise_ai.search import MODEL_NAME, DocumentIndex
+
+RUN_START = time.perf_counter()
+metrics.profile_start("Semantic Search")
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".embedding_cache")
 
 st.title("🔍 Semantic Search in Documents")
 st.caption("Upload files or use the built-in samples. Ask questions in natural language.")
@@ -11,8 +20,15 @@ st.sidebar.header("Documents")
 use_samples = st.sidebar.checkbox("Use sample documents", value=True)
 uploaded = st.sidebar.file_uploader("Or upload .txt files", type=["txt"], accept_multiple_files=True)
 
-corpus = []
-meta = []
+st.sidebar.header("Search backend")
+mode = st.sidebar.radio("Retrieval mode", list(MODES), format_func=MODES.get)
+backend = st.sidebar.selectbox("Index", ["exact", "ivf"], format_func=lambda b: {"exact": "Exact (brute force)", "ivf": "IVF (approximate)"}[b])
+nprobe = st.sidebar.slider("IVF lists to probe (recall vs. speed)", 1, 64, 8) if backend == "ivf" else None
+modes = inference.available_modes()
+infer_mode = st.sidebar.selectbox("Encoder precision (CPU)", modes, index=modes.index(inference.DEFAULT_MODE) if inference.DEFAULT_MODE in modes else 0)
+
+sources = []      # (name, load_fn) pairs; nothing is read until indexing
+source_keys = []  # cheap fingerprints so unchanged inputs skip re-indexing
 if use_samples:
     # Try multiple possible paths for the sample documents
     possible_paths = [
@@ -29,16 +45,10 @@ if use_samples:
             break
     
     if docs_dir:
-        txt_files = glob.glob(os.path.join(docs_dir, "*.txt"))
-        
-        for path in txt_files:
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    raw = f.read().strip()
-                corpus.append(raw)
-                meta.append(os.path.basename(path))
-            except Exception as e:
-                st.sidebar.error(f"Error reading {path}: {e}")
+        for name, path in discover_files(docs_dir):
+            stat = os.stat(path)
+            sources.append((name, partial(read_path, path)))
+            source_keys.append((name, stat.st_mtime_ns, stat.st_size))
     else:
         # Fallback: create sample documents inline
         st.sidebar.info("Using fallback sample documents...")
@@ -66,60 +76,73 @@ if use_samples:
         }
         
         for filename, content in sample_docs.items():
-            corpus.append(content)
-            meta.append(filename)
+            sources.append((filename, lambda content=content: content))
+            source_keys.append((filename,))
 
 if uploaded:
     for up in uploaded:
-        text = up.read().decode("utf-8", errors="ignore")
-        corpus.append(text)
-        meta.append(up.name)
+        sources.append((up.name, lambda up=up: decode_bytes(up.getvalue())))
+        source_keys.append((up.name, up.file_id, up.size))
 
-if not corpus:
+if not sources:
     st.info("Add some documents from the sidebar to begin.")
     st.stop()
 
-def chunk_text(text, max_chars=600):
-    parts = [p.strip() for p in text.splitlines() if p.strip()]
-    chunks, cur = [], ""
-    for p in parts:
-        if len(cur) + len(p) < max_chars:
-            cur += (" " + p if cur else p)
-        else:
-            chunks.append(cur)
-            cur = p
-    if cur:
-        chunks.append(cur)
-    return chunks
-
-rows = []
-for fname, doc in zip(meta, corpus):
-    for c in chunk_text(doc):
-        rows.append({"file": fname, "text": c})
-df = pd.DataFrame(rows)
+q = st.text_input("Ask a question", value="What is the notice period?")
+top_k = st.slider("Top-K results", 1, 10, 3)
 
-@st.cache_resource
-def load_model():
-    return SentenceTransformer("all-MiniLM-L6-v2")
+compare = st.checkbox("Compare latency of all modes")
 
-model = load_model()
+# Models load on a shared background thread; never block the first render on them
+models.warm_defaults()
+try:
+    model = models.sentence_model(infer_mode)
+except Exception as e:
+    st.error(f"Failed to load the search model ({MODEL_NAME}, {infer_mode}): {e}")
+    st.info("The load is retried automatically; interact with the page again in a moment.")
+    st.stop()
+models.track_startup("Semantic Search", st.session_state, RUN_START, ready=model is not None)
+if model is None:
+    st.info(f"⏳ Warming up the search model ({MODEL_NAME}, {infer_mode})... this page refreshes when it is ready.")
+    time.sleep(1)
+    st.rerun()
 
-@st.cache_data(show_spinner=False)
-def build_index(texts):
-    embs = model.encode(texts, normalize_embeddings=True)
-    return embs
+@st.cache_resource
+def load_store(mode):
+    # Shared across sessions; persisted vectors survive restarts and redeploys
+    return EmbeddingStore(CACHE_DIR, inference.store_name(MODEL_NAME, mode))
 
-embs = build_index(df["text"].tolist())
+@st.cache_resource(show_spinner="Indexing documents...", max_entries=8)
+def load_document_index(source_keys, mode, _sources):
+    # One long-lived index per distinct document set; reruns reuse it as-is
+    doc_index = DocumentIndex(models.sentence_model(mode, block=True), load_store(mode))
+    errors = doc_index.build(_sources)
+    return doc_index, errors
 
-q = st.text_input("Ask a question", value="What is the notice period?")
-top_k = st.slider("Top-K results", 1, 10, 3)
+doc_index, errors = load_document_index(tuple(source_keys), infer_mode, sources)
+for err in errors:
+    st.sidebar.error(err)
+if not len(doc_index):
+    st.info("Add some documents from the sidebar to begin.")
+    st.stop()
 
 if st.button("Search"):
-    q_emb = model.encode([q], normalize_embeddings=True)
-    sims = cosine_similarity(q_emb, embs)[0]
-    idx = sims.argsort()[::-1][:top_k]
+    res = doc_index.search(q, mode, top_k, backend, nprobe)
+    if res["cached"]:
+        st.caption(f"Served from result cache (first run took {res['timings']['total']:.1f} ms)")
+    else:
+        st.caption(" · ".join(f"{stage}: {ms:.1f} ms" for stage, ms in res["timings"].items()))
+    if compare:
+        st.table([
+            {"Mode": MODES[m], **{k: round(v, 2) for k, v in doc_index.search(q, m, top_k, backend, nprobe, use_cache=False)["timings"].items()}}
+            for m in MODES
+        ])
     st.subheader("Results")
-    for i in idx:
-        st.markdown(f"**{df.iloc[i]['file']}** — score: `{sims[i]:.3f}`")
-        st.write(df.iloc[i]["text"])
+    if not res["results"]:
+        st.info("No matching chunks. Lexical mode needs at least one shared term.")
+    for hit in res["results"]:
+        st.markdown(f"**{hit['file']}** — score: `{hit['score']:.3f}`")
+        st.write(hit["text"])
         st.markdown("---")
+
+metrics.profile_finish()
@@ -1,11 +1,22 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import os
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
-from sklearn.linear_model import LogisticRegression
+import hashlib
+import tempfile
+import time
+from enterprise_ai import metrics, models
+from enterprise_ai.leads import ModelRegistry, lead_reasons, read_leads_csv, score_csv, training_fingerprint
+from enterprise_ai.online_leads import OnlineLeadScorer
+
+RUN_START = time.perf_counter()
+metrics.profile_start("Lead Scoring")
+REGISTRY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".model_registry")
+# Server-side CSVs (multi-GB exports) are only read from inside this folder; unset, only uploads are accepted
+SERVER_CSV_DIR = os.environ.get("ENTERPRISE_AI_LEADS_DIR")
+
+TRAIN_ROWS = 50_000   # streaming mode fits on the head of the file
+CHUNK_ROWS = 100_000
+TOP_N = 50
 
 st.title("🤝 AI Lead Scoring Agent (Explainable)")
 st.caption("Upload a leads CSV or use the sample. Get scores plus human-readable reasons.")
@@ -27,7 +38,7 @@ def load_sample():
             break
     
     if csv_path:
-        return pd.read_csv(csv_path)
+        return read_leads_csv(csv_path)
     else:
         # Fallback: create sample data inline
         st.info("Using fallback sample data...")
@@ -42,81 +53,130 @@ def load_sample():
             "Region": ["EU", "US", "EU", "EMEA", "EU"]
         })
 
+@st.cache_resource
+def load_registry():
+    return ModelRegistry(REGISTRY_DIR)
+
+@st.cache_resource(show_spinner="Loading lead model...", max_entries=8)
+def load_scorer(fingerprint, _df):
+    # Fitted once per training set and persisted; restarts load it from disk
+    scorer, _, fitted = load_registry().load_or_fit(_df, fingerprint)
+    return scorer, fitted
+
+@st.cache_resource(show_spinner="Training online model...", max_entries=8)
+def load_online_scorer(fingerprint, _df):
+    # One shared online model per base training set; updates are visible to every session
+    return OnlineLeadScorer().fit(_df)
+
+@st.cache_resource(show_spinner="Reading leads...", max_entries=4)
+def load_leads(source_key, _src):
+    # Parsed and fingerprinted once per file (upload id or path + mtime), not on every rerun;
+    # shared read-only, so reruns skip the copy cache_data would make
+    if _src is None:
+        df = load_sample()
+    else:
+        if hasattr(_src, "seek"):
+            _src.seek(0)
+        df = read_leads_csv(_src)
+    return df, training_fingerprint(df)
+
+def fit_scorer(fingerprint, df):
+    scorer, fitted = load_scorer(fingerprint, df)
+    st.caption(f"Lead model `{fingerprint[:12]}` — {'trained on this data' if fitted else 'loaded from registry'}")
+    return scorer
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def score_leads(source_key, fingerprint, _df):
+    return load_scorer(fingerprint, _df)[0].score(_df)
+
+@st.cache_data(show_spinner="Scoring leads in chunks...", max_entries=4)
+def stream_score(source_key, _src, out_format):
+    # Keyed on the file identity, so form submissions don't rescore a multi-GB export
+    train = read_leads_csv(_src, nrows=TRAIN_ROWS)
+    if hasattr(_src, "seek"):
+        _src.seek(0)
+    out_path = os.path.join(tempfile.gettempdir(), f"scored_leads_{hashlib.sha1(repr(source_key).encode()).hexdigest()[:12]}.{out_format}")
+    fingerprint = training_fingerprint(train)
+    top, rows = score_csv(load_scorer(fingerprint, train)[0], _src, out_path, chunksize=CHUNK_ROWS, top_n=TOP_N)
+    return train, fingerprint, top, rows, out_path
+
 use_sample = st.checkbox("Use sample leads.csv", value=True)
+streaming = False
 if use_sample:
-    df = load_sample()
+    src, source_key = None, ("sample",)
 else:
     up = st.file_uploader("Upload leads.csv", type=["csv"])
-    if up:
-        df = pd.read_csv(up)
-    else:
+    server_path = ""
+    if SERVER_CSV_DIR:
+        name = st.text_input("...or the name of a CSV in the server's leads folder (for multi-GB exports)", "")
+        if name:
+            root = os.path.realpath(SERVER_CSV_DIR)
+            server_path = os.path.realpath(os.path.join(root, name))
+            if os.path.commonpath([root, server_path]) != root or not server_path.endswith(".csv") or not os.path.isfile(server_path):
+                st.error("No such CSV in the server's leads folder.")
+                st.stop()
+    streaming = st.checkbox("Streaming mode (score in chunks, keep only the top leads in memory)", value=bool(server_path))
+    if not (up or server_path):
         st.info("Upload a CSV or use the sample to continue.")
         st.stop()
+    if server_path:
+        stat = os.stat(server_path)
+        src, source_key = server_path, (server_path, f"{stat.st_mtime_ns}_{stat.st_size}")
+    else:
+        src, source_key = up, (up.name, up.file_id)
 
-st.dataframe(df)
-
-num_cols = ["EngagementLevel","PagesViewed","RequestedPricing"]
-cat_cols = ["CompanySize","Industry","LeadSource","Region"]
-
-pre = ColumnTransformer([
-    ("num","passthrough", num_cols),
-    ("cat", OneHotEncoder(handle_unknown="ignore"), cat_cols)
-])
-
-clf = Pipeline([
-    ("pre", pre),
-    ("lr", LogisticRegression(max_iter=1000))
-])
-
-if "did_convert" not in df.columns:
-    rng = np.random.default_rng(42)
-    def heuristic(row):
-        s = 0
-        s += row.get("EngagementLevel",0) * 0.8
-        s += min(row.get("PagesViewed",0), 15) * 0.2
-        s += 2.0 if row.get("RequestedPricing",0) == 1 else 0
-        s += 1.5 if row.get("CompanySize","") in ("Enterprise","Mid-Market") else 0.5
-        s += 1.0 if row.get("LeadSource","") in ("Referral","Conference","Webinar") else 0
-        return s
-    base = df.apply(heuristic, axis=1).values
-    prob = 1/(1+np.exp(-(base - base.mean())/2.0))
-    did = (prob > rng.random(len(prob))).astype(int)
-    df["did_convert"] = did
-
-X = df.drop(columns=[c for c in ["did_convert","Name"] if c in df.columns])
-y = df["did_convert"]
-clf.fit(X, y)
-
-st.subheader("Lead Scores")
-def score_row(row):
+if streaming:
+    out_format = st.radio("Scored output format", ["csv", "parquet"], horizontal=True)
+    try:
+        train, fingerprint, top, rows, out_path = stream_score(source_key, src, out_format)
+    except ImportError as e:
+        st.error(str(e))
+        st.stop()
+    except ValueError as e:
+        st.error(f"Could not read the leads CSV: {e}")
+        st.stop()
+    scorer = fit_scorer(fingerprint, train)
+    st.subheader(f"Top {TOP_N} of {rows:,} leads")
+    st.dataframe(top)
+    with open(out_path, "rb") as f:
+        st.download_button("Download all scores", f, file_name=os.path.basename(out_path))
+else:
     try:
-        # Convert the Series to a DataFrame with proper column names
-        row_df = pd.DataFrame([row.values], columns=row.index)
-        proba = clf.predict_proba(row_df)[0,1]
-        reasons = []
-        if "RequestedPricing" in row and row["RequestedPricing"] == 1:
-            reasons.append("Requested pricing → high intent")
-        if "EngagementLevel" in row and row["EngagementLevel"] >= 4:
-            reasons.append("High engagement level")
-        if "PagesViewed" in row and row["PagesViewed"] >= 10:
-            reasons.append("Multiple page views")
-        if "LeadSource" in row and row["LeadSource"] in ("Referral","Conference","Webinar"):
-            reasons.append("Strong source: " + str(row["LeadSource"]))
-        if "CompanySize" in row and row["CompanySize"] in ("Enterprise","Mid-Market"):
-            reasons.append("Company size: " + str(row["CompanySize"]))
-        return float(proba), "; ".join(reasons)
-    except Exception as e:
-        st.error(f"Error scoring lead: {e}")
-        return 0.0, "Error in scoring"
-
-scored = []
-for i, r in X.iterrows():
-    p, why = score_row(r)
-    name = df.loc[i, "Name"] if "Name" in df.columns else f"Lead {i+1}"
-    scored.append({"Name": name, "Score": round(p,3), "Reasons": why})
-
-out = pd.DataFrame(scored).sort_values("Score", ascending=False)
-st.dataframe(out)
+        df, fingerprint = load_leads(source_key, src)
+    except ValueError as e:
+        st.error(f"Could not read the leads CSV: {e}")
+        st.stop()
+    st.dataframe(df)
+    scorer = fit_scorer(fingerprint, df)
+
+    with st.expander("Online learning (update from new conversion outcomes)"):
+        use_online = st.checkbox("Score with the online model", value=False)
+        outcomes = st.file_uploader("Newly labelled leads (CSV with a did_convert column)", type=["csv"], key="outcomes")
+        update = outcomes is not None and st.button("Update online model")
+        # Expander bodies always run, so only train the online model once someone uses it
+        online = load_online_scorer(fingerprint, df) if use_online or update else None
+        if update:
+            try:
+                batch = read_leads_csv(outcomes)
+                start = time.perf_counter()
+                online.update(batch)
+                st.success(f"Learned from {len(batch):,} outcomes in {(time.perf_counter() - start) * 1000:.1f} ms")
+            except Exception as e:
+                st.error(f"Update failed: {e}")
+        if online is not None:
+            st.caption(f"Online model has seen {online.n_seen:,} labelled leads.")
+        else:
+            st.caption("The online model is trained on first use.")
+    if use_online:
+        scorer = online
+
+    st.subheader("Lead Scores")
+    out = online.score(df) if use_online else score_leads(source_key, fingerprint, df)
+    st.dataframe(out)
+
+models.track_startup("Lead Scoring", st.session_state, RUN_START, ready=True)
+# Nothing here needs the transformer models, but start them for the other pages
+models.warm_defaults()
 
 st.subheader("Add a Custom Lead")
 with st.form("add_lead"):
@@ -129,7 +189,7 @@ with st.form("add_lead"):
     region = st.text_input("Region", "EU")
     submitted = st.form_submit_button("Score lead")
     if submitted:
-        new = pd.DataFrame([{
+        new = {
             "CompanySize": company_size,
             "Industry": industry,
             "EngagementLevel": engagement,
@@ -137,16 +197,15 @@ with st.form("add_lead"):
             "RequestedPricing": requested,
             "LeadSource": source,
             "Region": region
-        }])
+        }
         try:
-            proba = float(clf.predict_proba(new)[0,1])
+            proba, reasons = scorer.score_one(new)
             st.success(f"Predicted conversion score: {proba:.3f}")
         except Exception as e:
             st.error(f"Error predicting score: {e}")
-            proba = 0.0
+            proba, reasons = 0.0, lead_reasons(new)
         st.write("Reasons:")
-        if requested == 1: st.write("- Requested pricing → high intent")
-        if engagement >= 4: st.write("- High engagement level")
-        if pages >= 10: st.write("- Multiple page views")
-        if source in ("Referral","Conference","Webinar"): st.write(f"- Strong source: {source}")
-        if company_size in ("Enterprise","Mid-Market"): st.write(f"- Company size: {company_size}")
+        for reason in reasons:
+            st.write(f"- {reason}")
+
+metrics.profile_finish()
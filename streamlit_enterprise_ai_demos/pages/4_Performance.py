@@ -0,0 +1,80 @@
+import streamlit as st
+import pandas as pd
+import json
+import os
+import time
+from enterprise_ai import metrics
+
+st.title("⏱️ Performance")
+st.caption("Where time goes across the demos: per-stage timings, cache hit rates and model memory, for this server process.")
+
+# Collect a profile whose run ended early (st.stop / st.rerun) before showing anything
+metrics.profile_finish()
+
+snap = metrics.snapshot()
+if not snap["enabled"]:
+    st.warning("Recording is off (ENTERPRISE_AI_METRICS=0).")
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Process RSS", f"{snap['memory']['rss_mb']:,.0f} MB")
+col2.metric("Stages recorded", len(snap["stages"]))
+col3.metric("Timed calls", f"{sum(s['count'] for s in snap['stages'].values()):,}")
+
+st.subheader("Stages")
+if snap["stages"]:
+    stages = pd.DataFrame([
+        {"stage": name, **{k: v for k, v in s.items() if k != "histogram"}}
+        for name, s in snap["stages"].items()
+    ]).sort_values("total_ms", ascending=False)
+    st.dataframe(stages, hide_index=True)
+    stage = st.selectbox("Histogram for", stages["stage"])
+    hist = snap["stages"][stage]["histogram"]
+    st.bar_chart(pd.Series(hist, name="calls").reindex([f"<={b:g}ms" for b in metrics.BUCKETS_MS], fill_value=0))
+else:
+    st.info("Nothing recorded yet - run a search, score some leads or generate an email, then come back.")
+
+st.subheader("Caches")
+if snap["caches"]:
+    st.dataframe(pd.DataFrame(snap["caches"]).T, column_config={"hit_rate": st.column_config.ProgressColumn(min_value=0, max_value=1)})
+if snap["counters"]:
+    st.json(snap["counters"])
+
+st.subheader("Models")
+models = snap["models"]["models"]
+if models:
+    st.dataframe(pd.DataFrame(models).T)
+else:
+    st.info("No model has been requested yet.")
+if snap["models"]["pages"]:
+    st.caption("Page startup (first session to open each page)")
+    st.dataframe(pd.DataFrame(snap["models"]["pages"]).T)
+
+st.subheader("Export")
+left, right = st.columns(2)
+left.download_button("Download stats (JSON)", json.dumps(snap, indent=2, default=str),
+                     file_name=f"enterprise_ai_stats_{int(snap['taken_at'])}.json", mime="application/json")
+if right.button("Reset stats"):
+    metrics.reset()
+    st.rerun()
+st.button("Refresh")
+
+st.subheader("Profiling")
+st.caption("Capture a cProfile dump of the next interaction on any demo page. Profiling slows that run down.")
+state = metrics.profile_state()
+if state["active"]:
+    st.info(f"Profiling a run of {state['active']}...")
+elif state["armed"]:
+    st.info("Armed - interact with a demo page, then come back here.")
+elif st.button("Profile next interaction"):
+    metrics.arm_profile()
+    st.rerun()
+
+for i, dump in enumerate(metrics.profile_dumps()):
+    label = f"{dump['page']} · {time.strftime('%H:%M:%S', time.localtime(dump['at']))} · {dump['wall_ms']:,.0f} ms"
+    with st.expander(label, expanded=i == 0):
+        if dump["interrupted"]:
+            st.caption("The run ended early (stop or rerun), so wall time includes idle time until it was collected.")
+        st.code(dump["text"], language="text")
+        if os.path.exists(dump["path"]):
+            with open(dump["path"], "rb") as f:
+                st.download_button("Download .prof (snakeviz / pstats)", f.read(), file_name=os.path.basename(dump["path"]), key=f"prof_{i}")
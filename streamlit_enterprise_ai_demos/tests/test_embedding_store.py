@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+
+from enterprise_ai.embedding_store import EmbeddingStore
+
+
+def fake_encode(texts):
+    # Distinct, deterministic vector per text
+    return np.array([[len(t), ord(t[0]), 1.0, -1.0] for t in texts], dtype=np.float32)
+
+
+def test_two_writers_on_one_directory(tmp_path):
+    a = EmbeddingStore(tmp_path, "m")
+    b = EmbeddingStore(tmp_path, "m")
+    np.testing.assert_array_equal(a.encode(["alpha"], fake_encode), fake_encode(["alpha"]))
+    np.testing.assert_array_equal(b.encode(["beta!!"], fake_encode), fake_encode(["beta!!"]))
+    # Each instance sees the other's rows without re-encoding them
+    calls = []
+    out = a.encode(["beta!!", "alpha"], lambda t: calls.append(t) or fake_encode(t))
+    np.testing.assert_array_equal(out, fake_encode(["beta!!", "alpha"]))
+    assert calls == []
+    reopened = EmbeddingStore(tmp_path, "m")
+    np.testing.assert_array_equal(reopened.encode(["alpha", "beta!!"], fake_encode), fake_encode(["alpha", "beta!!"]))
+
+
+def test_orphan_vector_from_crash_is_dropped(tmp_path):
+    store = EmbeddingStore(tmp_path, "m")
+    store.encode(["alpha"], fake_encode)
+    # Simulate a crash after the vector append but before the key append
+    with open(os.path.join(store.dir, "vectors.f16"), "ab") as f:
+        f.write(fake_encode(["orphan"]).astype(np.float16).tobytes())
+    recovered = EmbeddingStore(tmp_path, "m")
+    np.testing.assert_array_equal(recovered.encode(["gamma!!!"], fake_encode), fake_encode(["gamma!!!"]))
+    reopened = EmbeddingStore(tmp_path, "m")
+    np.testing.assert_array_equal(reopened.encode(["alpha", "gamma!!!"], fake_encode), fake_encode(["alpha", "gamma!!!"]))
+    assert os.path.getsize(os.path.join(store.dir, "vectors.f16")) == 2 * 4 * 2
+
+
+def test_partial_key_line_is_ignored(tmp_path):
+    store = EmbeddingStore(tmp_path, "m")
+    store.encode(["alpha"], fake_encode)
+    with open(os.path.join(store.dir, "keys.txt"), "a", encoding="utf-8") as f:
+        f.write("deadbeef")
+    reopened = EmbeddingStore(tmp_path, "m")
+    assert len(reopened) == 1
+    np.testing.assert_array_equal(reopened.encode(["beta!!", "alpha"], fake_encode), fake_encode(["beta!!", "alpha"]))
@@ -0,0 +1,25 @@
+from enterprise_ai.ingest import approx_tokens, chunk_text
+
+
+def test_long_line_is_split_at_word_boundaries():
+    words = [f"w{i}" for i in range(300)]
+    text = "intro line\n" + " ".join(words) + "\noutro line"
+    for overlap in (0, 1):
+        chunks = chunk_text(text, 128, overlap, approx_tokens)
+        assert all(approx_tokens(c) < 128 for c in chunks)
+        # Every word survives, in order, and none is cut in half
+        seen = [w for c in chunks for w in c.split() if w.startswith("w")]
+        assert sorted(set(seen), key=lambda w: int(w[1:])) == words
+        assert all(w in words for w in seen)
+
+
+def test_overlap_kept_around_split_lines():
+    text = " ".join(f"w{i}" for i in range(300))
+    chunks = chunk_text(text, 128, 1, approx_tokens)
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert set(prev.split()) & set(nxt.split())
+
+
+def test_short_lines_are_packed_unchanged():
+    assert chunk_text("alpha\nbeta\n\ngamma", max_size=600) == ["alpha beta gamma"]
+    assert chunk_text("a b c\n" + "x" * 50, max_size=10) == ["a b c", "x" * 50]